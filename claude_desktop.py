@@ -39,6 +39,8 @@ import time
 import hashlib
 import re
 from collections import defaultdict, deque
+from functools import lru_cache
+from types import MappingProxyType
 import logging
 from typing import Dict, List, Optional, Tuple, Any, Callable
 import random
@@ -1257,6 +1259,41 @@ class ConversationDatabase:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
+        conversation_id = self._insert_conversation(cursor, session_id, messages, title, summary)
+        
+        conn.commit()
+        conn.close()
+        return conversation_id
+    
+    def save_conversations_bulk(self, conversations: List[Dict]) -> List[int]:
+        """Save several conversations in a single transaction
+        
+        Each item is a dict with 'session_id' and 'messages', plus optional
+        'title' and 'summary', mirroring the save_conversation arguments.
+        """
+        # Autocommit mode with an explicit BEGIN so the whole batch is one transaction
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        cursor = conn.cursor()
+        
+        conversation_ids = []
+        try:
+            cursor.execute('BEGIN')
+            for conversation in conversations:
+                conversation_ids.append(self._insert_conversation(
+                    cursor, conversation['session_id'], conversation['messages'],
+                    conversation.get('title'), conversation.get('summary')
+                ))
+            cursor.execute('COMMIT')
+        except Exception:
+            cursor.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+        return conversation_ids
+    
+    def _insert_conversation(self, cursor: sqlite3.Cursor, session_id: str, messages: List[Dict],
+                             title: str = None, summary: str = None) -> int:
+        """Insert a conversation and its messages using an open cursor"""
         # Calculate conversation metrics
         total_messages = len(messages)
         total_tokens = sum(msg.get('tokens', 0) for msg in messages)
@@ -1271,15 +1308,13 @@ class ConversationDatabase:
         conversation_id = cursor.lastrowid
         
         # Insert messages
-        for msg in messages:
-            cursor.execute('''
-                INSERT INTO messages (conversation_id, role, content, tokens, response_time, quality_score)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (conversation_id, msg['role'], msg['content'], 
-                  msg.get('tokens', 0), msg.get('response_time', 0), msg.get('quality_score', 0)))
+        cursor.executemany('''
+            INSERT INTO messages (conversation_id, role, content, tokens, response_time, quality_score)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', [(conversation_id, msg['role'], msg['content'],
+               msg.get('tokens', 0), msg.get('response_time', 0), msg.get('quality_score', 0))
+              for msg in messages])
         
-        conn.commit()
-        conn.close()
         return conversation_id
     
     def get_conversation_analytics(self, days: int = 30) -> Dict:
@@ -1438,17 +1473,41 @@ class ConversationDatabase:
         conn.commit()
         conn.close()
 
+TOPIC_PATTERNS = {
+    'coding': ['code', 'programming', 'python', 'javascript', 'function', 'class', 'variable'],
+    'writing': ['write', 'essay', 'article', 'content', 'draft', 'edit'],
+    'analysis': ['analyze', 'data', 'research', 'study', 'report', 'statistics'],
+    'creative': ['creative', 'story', 'poem', 'idea', 'brainstorm', 'imagine'],
+    'technical': ['technical', 'system', 'architecture', 'design', 'implementation']
+}
+
+# One alternation per topic so each topic is scored in a single regex scan
+_TOPIC_REGEXES = {
+    topic: re.compile('|'.join(map(re.escape, keywords)))
+    for topic, keywords in TOPIC_PATTERNS.items()
+}
+
+@lru_cache(maxsize=4096)
+def _identify_topic_cached(content: str) -> str:
+    """Keyword-based topic lookup, cached across analyzer instances"""
+    content_lower = content.lower()
+    
+    topic_scores = {}
+    for topic, pattern in _TOPIC_REGEXES.items():
+        score = len(set(pattern.findall(content_lower)))  # distinct keywords matched
+        if score > 0:
+            topic_scores[topic] = score
+    
+    if topic_scores:
+        return max(topic_scores, key=topic_scores.get)
+    
+    return 'general'
+
 class ConversationAnalyzer:
     """Analyzer for conversation quality and insights"""
     
     def __init__(self):
-        self.topic_patterns = {
-            'coding': ['code', 'programming', 'python', 'javascript', 'function', 'class', 'variable'],
-            'writing': ['write', 'essay', 'article', 'content', 'draft', 'edit'],
-            'analysis': ['analyze', 'data', 'research', 'study', 'report', 'statistics'],
-            'creative': ['creative', 'story', 'poem', 'idea', 'brainstorm', 'imagine'],
-            'technical': ['technical', 'system', 'architecture', 'design', 'implementation']
-        }
+        self.topic_patterns = TOPIC_PATTERNS
     
     def analyze_conversation_quality(self, messages: List[Dict]) -> float:
         """Analyze conversation quality based on various metrics"""
@@ -1504,18 +1563,7 @@ class ConversationAnalyzer:
     
     def identify_topic(self, content: str) -> str:
         """Identify the main topic of a message"""
-        content_lower = content.lower()
-        
-        topic_scores = {}
-        for topic, keywords in self.topic_patterns.items():
-            score = sum(1 for keyword in keywords if keyword in content_lower)
-            if score > 0:
-                topic_scores[topic] = score
-        
-        if topic_scores:
-            return max(topic_scores, key=topic_scores.get)
-        
-        return 'general'
+        return _identify_topic_cached(content)
     
     def generate_conversation_summary(self, messages: List[Dict]) -> str:
         """Generate a summary of the conversation"""
@@ -1917,6 +1965,12 @@ class PersonalitySystem:
             'speaking_style': current['speaking_style']
         }
 
+# API parameters for universal mode; blended for versatility and balanced creativity/focus
+UNIVERSAL_MODE_PARAMS = MappingProxyType({
+    'max_tokens': 1500,
+    'temperature': 0.6
+})
+
 class EnhancedClaudeDesktopApp:
     """Enhanced Claude Desktop Application with analytics and improved features"""
     
@@ -2698,12 +2752,7 @@ class EnhancedClaudeDesktopApp:
     
     def get_mode_parameters(self) -> Dict:
         """Get API parameters for universal mode"""
-        base_params = {
-            'model': self.config.get('model'),
-            'max_tokens': 1500,  # Blended max_tokens for versatility
-            'temperature': 0.6   # Blended temperature for balanced creativity and focus
-        }
-        return base_params
+        return {'model': self.config.get('model'), **UNIVERSAL_MODE_PARAMS}
     
     def on_enter_key(self, event):
         """Handle Enter key press"""
@@ -160,40 +160,56 @@ def test_encryption_decryption():
         print(f"❌ Test failed: {e}")
         return False
 
+SECURITY_INFO = """\
+🔒 Security Information
+==================================================
+
+🔐 Encryption Details:
+- Algorithm: AES-256 with Fernet
+- Key Derivation: PBKDF2 with SHA-256
+- Salt: 16 bytes, randomly generated
+- Iterations: 100,000
+
+🛡️  Security Features:
+- Master password-based encryption
+- Data integrity verification (HMAC)
+- Secure session management
+- API request rate limiting
+- Audit logging
+
+📝 Best Practices:
+- Store encrypted keys in environment variables
+- Use secure master passwords
+- Regularly rotate API keys
+- Monitor security audit logs
+- Keep the security salt file secure
+
+⚠️  Important Notes:
+- The master password is auto-generated if not provided
+- Store the master password securely
+- Back up the security salt file
+- Don't share encrypted keys without proper authorization
+"""
+
+USAGE = """\
+🔐 Claude Desktop AI - API Key Encryption Utility
+==================================================
+
+Usage:
+  python encrypt_api_key.py encrypt    - Encrypt an API key
+  python encrypt_api_key.py decrypt    - Decrypt an API key (testing)
+  python encrypt_api_key.py test       - Test encryption/decryption
+  python encrypt_api_key.py info       - Show security information
+
+Examples:
+  python encrypt_api_key.py encrypt
+  python encrypt_api_key.py test
+
+"""
+
 def show_security_info():
     """Show security information"""
-    print("🔒 Security Information")
-    print("=" * 50)
-    print()
-    
-    print("🔐 Encryption Details:")
-    print("- Algorithm: AES-256 with Fernet")
-    print("- Key Derivation: PBKDF2 with SHA-256")
-    print("- Salt: 16 bytes, randomly generated")
-    print("- Iterations: 100,000")
-    print()
-    
-    print("🛡️  Security Features:")
-    print("- Master password-based encryption")
-    print("- Data integrity verification (HMAC)")
-    print("- Secure session management")
-    print("- API request rate limiting")
-    print("- Audit logging")
-    print()
-    
-    print("📝 Best Practices:")
-    print("- Store encrypted keys in environment variables")
-    print("- Use secure master passwords")
-    print("- Regularly rotate API keys")
-    print("- Monitor security audit logs")
-    print("- Keep the security salt file secure")
-    print()
-    
-    print("⚠️  Important Notes:")
-    print("- The master password is auto-generated if not provided")
-    print("- Store the master password securely")
-    print("- Back up the security salt file")
-    print("- Don't share encrypted keys without proper authorization")
+    sys.stdout.write(SECURITY_INFO)
 
 def main():
     """Main function"""
@@ -213,19 +229,7 @@ def main():
             print(f"Unknown command: {command}")
             success = False
     else:
-        print("🔐 Claude Desktop AI - API Key Encryption Utility")
-        print("=" * 50)
-        print()
-        print("Usage:")
-        print("  python encrypt_api_key.py encrypt    - Encrypt an API key")
-        print("  python encrypt_api_key.py decrypt    - Decrypt an API key (testing)")
-        print("  python encrypt_api_key.py test       - Test encryption/decryption")
-        print("  python encrypt_api_key.py info       - Show security information")
-        print()
-        print("Examples:")
-        print("  python encrypt_api_key.py encrypt")
-        print("  python encrypt_api_key.py test")
-        print()
+        sys.stdout.write(USAGE)
         
         # Interactive mode
         print("Or run interactively:")
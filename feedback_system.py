@@ -4,29 +4,149 @@ import json
 import sqlite3
 import os
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import threading
+import queue
+import atexit
 import time
 import uuid
-from collections import defaultdict
+import weakref
+import re
+import hashlib
+from collections import Counter, defaultdict
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Background writer so feedback inserts never block the Tk main thread
+_write_queue: "queue.Queue" = queue.Queue()
+_writer_thread = None
+_writer_thread_lock = threading.Lock()
+
+def _writer_loop():
+    """Drain queued database calls on the writer thread"""
+    while True:
+        func, args = _write_queue.get()
+        try:
+            func(*args)
+        except Exception as e:
+            logger.error(f"Background feedback write failed: {e}")
+        finally:
+            _write_queue.task_done()
+
+def submit_background_write(func, *args):
+    """Queue a FeedbackDatabase call to run on the background writer thread"""
+    global _writer_thread
+    with _writer_thread_lock:
+        if _writer_thread is None:
+            _writer_thread = threading.Thread(target=_writer_loop, name="feedback-writer", daemon=True)
+            _writer_thread.start()
+            # Let queued writes land before the interpreter exits
+            atexit.register(_write_queue.join)
+    _write_queue.put((func, args))
+
+# Every live FeedbackDatabase, held weakly so registering one never keeps it alive
+_open_databases: "weakref.WeakSet" = weakref.WeakSet()
+
+def _flush_open_databases():
+    """Write out buffered feature usage; the flush timer is a daemon thread and dies at exit"""
+    for db in list(_open_databases):
+        db.flush_feature_usage()
+
+atexit.register(_flush_open_databases)
+
+# Words ignored when bucketing comments into themes
+_THEME_STOPWORDS = frozenset((
+    'a', 'an', 'the', 'and', 'or', 'but', 'is', 'are', 'was', 'were', 'be', 'it', 'its',
+    'this', 'that', 'to', 'of', 'in', 'on', 'for', 'with', 'as', 'at', 'by', 'so',
+    'i', 'me', 'my', 'you', 'your', 'we', 'very', 'really', 'just', 'too'
+))
+_THEME_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+def comment_theme_hash(comment: Optional[str]) -> Optional[int]:
+    """Stable 64-bit hash of a comment's significant words, ignoring order and case"""
+    if not comment or not comment.strip():
+        return None
+    tokens = set(_THEME_TOKEN_RE.findall(comment.lower()))
+    key = ' '.join(sorted(tokens - _THEME_STOPWORDS or tokens))
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(),
+                          'big', signed=True)
+
 class FeedbackDatabase:
     """Database for storing user feedback and analytics"""
     
+    # Seconds to buffer feature usage events before writing them in one transaction
+    FEATURE_USAGE_FLUSH_INTERVAL = 1.0
+    # Seconds a cached get_feedback_analytics result stays valid if nothing was written
+    ANALYTICS_CACHE_TTL = 60.0
+    # Stored in PRAGMA user_version; bump whenever init_database changes the schema
+    SCHEMA_VERSION = 1
+    
     def __init__(self, db_path: str = "feedback.db"):
         self.db_path = db_path
+        self._uri = False
+        self._memory_anchor = None
+        if db_path == ":memory:":
+            # Per-thread connections must all see one database, so use a named
+            # shared-cache memory DB kept alive by an anchor connection
+            self.db_path = f"file:feedback-{uuid.uuid4().hex}?mode=memory&cache=shared"
+            self._uri = True
+            self._memory_anchor = sqlite3.connect(self.db_path, uri=True, check_same_thread=False)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._usage_buffer: Counter = Counter()  # (feature_name, user_session) -> count
+        self._usage_lock = threading.Lock()
+        self._flush_timer = None
+        self._write_epoch = 0  # bumped on every write so cached analytics go stale
+        self._analytics_cache: Dict[int, Tuple[float, int, Dict]] = {}
         self.init_database()
+        _open_databases.add(self)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the per-connection performance PRAGMAs applied"""
+        conn = sqlite3.connect(self.db_path, uri=self._uri)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+    
+    def _conn(self) -> sqlite3.Connection:
+        """Return this thread's cached connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+    
+    def close(self):
+        """Flush pending feature usage and close the calling thread's cached connection"""
+        self.flush_feature_usage()
+        self._close_thread_conn()
+    
+    def _close_thread_conn(self):
+        """Close the calling thread's cached connection, if any"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
     
     def init_database(self):
         """Initialize feedback database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._conn()
         cursor = conn.cursor()
         
+        # Up-to-date databases skip the DDL entirely
+        cursor.execute("PRAGMA user_version")
+        if cursor.fetchone()[0] >= self.SCHEMA_VERSION:
+            return
+        
+        # WAL is persistent in the database file, so it only needs setting once
+        cursor.execute("PRAGMA journal_mode=WAL")
+        
         # User feedback table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS user_feedback (
@@ -39,7 +159,8 @@ class FeedbackDatabase:
                 bug_report TEXT,
                 timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
                 response_time REAL,
-                conversation_context TEXT
+                conversation_context TEXT,
+                comment_hash INTEGER
             )
         ''')
         
@@ -80,143 +201,219 @@ class FeedbackDatabase:
             )
         ''')
         
+        # One row per (feature, session) so usage can be recorded with an UPSERT
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'ux_feature_usage'")
+        if cursor.fetchone() is None:
+            # Fold duplicate rows left by older versions into the lowest id first
+            cursor.execute('''
+                UPDATE feature_usage SET
+                    usage_count = (SELECT SUM(f.usage_count) FROM feature_usage f
+                                   WHERE f.feature_name = feature_usage.feature_name
+                                   AND f.user_session IS feature_usage.user_session),
+                    last_used = (SELECT MAX(f.last_used) FROM feature_usage f
+                                 WHERE f.feature_name = feature_usage.feature_name
+                                 AND f.user_session IS feature_usage.user_session)
+                WHERE id IN (SELECT MIN(id) FROM feature_usage
+                             GROUP BY feature_name, user_session HAVING COUNT(*) > 1)
+            ''')
+            cursor.execute('''
+                DELETE FROM feature_usage WHERE id NOT IN (
+                    SELECT MIN(id) FROM feature_usage GROUP BY feature_name, user_session
+                )
+            ''')
+            cursor.execute('''
+                CREATE UNIQUE INDEX IF NOT EXISTS ux_feature_usage
+                ON feature_usage(feature_name, user_session)
+            ''')
+        
+        # Theme bucket per comment, backfilled for rows written by older versions
+        cursor.execute("PRAGMA table_info(user_feedback)")
+        if 'comment_hash' not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute("ALTER TABLE user_feedback ADD COLUMN comment_hash INTEGER")
+        cursor.execute("SELECT id, comment FROM user_feedback WHERE comment_hash IS NULL AND comment != ''")
+        cursor.executemany("UPDATE user_feedback SET comment_hash = ? WHERE id = ?",
+                           [(comment_theme_hash(comment), row_id) for row_id, comment in cursor.fetchall()])
+        
+        # Indexes for the time-windowed analytics queries
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS ix_user_feedback_ts_rating
+            ON user_feedback(timestamp, rating)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS ix_feature_usage_last_used
+            ON feature_usage(last_used, feature_name, usage_count)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS ix_user_feedback_comment_hash
+            ON user_feedback(comment_hash)
+        ''')
+        
+        cursor.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
         conn.commit()
-        conn.close()
     
     def save_feedback(self, feedback_data: Dict) -> int:
         """Save user feedback to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO user_feedback (
-                session_id, feedback_type, rating, comment, feature_request, 
-                bug_report, response_time, conversation_context
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            feedback_data.get('session_id', ''),
-            feedback_data.get('feedback_type', ''),
-            feedback_data.get('rating'),
-            feedback_data.get('comment', ''),
-            feedback_data.get('feature_request', ''),
-            feedback_data.get('bug_report', ''),
-            feedback_data.get('response_time'),
-            feedback_data.get('conversation_context', '')
-        ))
-        
-        feedback_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        return feedback_id
+        with self._write_lock, self._conn() as conn:
+            cursor = conn.execute('''
+                INSERT INTO user_feedback (
+                    session_id, feedback_type, rating, comment, feature_request, 
+                    bug_report, response_time, conversation_context, comment_hash
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                feedback_data.get('session_id', ''),
+                feedback_data.get('feedback_type', ''),
+                feedback_data.get('rating'),
+                feedback_data.get('comment', ''),
+                feedback_data.get('feature_request', ''),
+                feedback_data.get('bug_report', ''),
+                feedback_data.get('response_time'),
+                feedback_data.get('conversation_context', ''),
+                comment_theme_hash(feedback_data.get('comment'))
+            ))
+            self._write_epoch += 1
+        
+        return cursor.lastrowid
     
     def save_response_rating(self, message_id: str, rating: int, feedback_text: str = "") -> int:
         """Save rating for a specific response"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO response_ratings (message_id, rating, feedback_text)
-            VALUES (?, ?, ?)
-        ''', (message_id, rating, feedback_text))
-        
-        rating_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        return rating_id
+        with self._write_lock, self._conn() as conn:
+            cursor = conn.execute('''
+                INSERT INTO response_ratings (message_id, rating, feedback_text)
+                VALUES (?, ?, ?)
+            ''', (message_id, rating, feedback_text))
+            self._write_epoch += 1
+        
+        return cursor.lastrowid
     
     def track_feature_usage(self, feature_name: str, user_session: str = ""):
-        """Track feature usage"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Check if feature already exists for this session
-        cursor.execute('''
-            SELECT id, usage_count FROM feature_usage 
-            WHERE feature_name = ? AND user_session = ?
-        ''', (feature_name, user_session))
-        
-        result = cursor.fetchone()
-        
-        if result:
-            # Update existing record
-            cursor.execute('''
-                UPDATE feature_usage 
-                SET usage_count = usage_count + 1, last_used = CURRENT_TIMESTAMP
-                WHERE id = ?
-            ''', (result[0],))
-        else:
-            # Insert new record
-            cursor.execute('''
-                INSERT INTO feature_usage (feature_name, user_session)
-                VALUES (?, ?)
-            ''', (feature_name, user_session))
+        """Track feature usage; events are buffered and written in batches"""
+        with self._usage_lock:
+            self._usage_buffer[(feature_name, user_session)] += 1
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.FEATURE_USAGE_FLUSH_INTERVAL,
+                                                    self._flush_feature_usage_from_timer)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def _flush_feature_usage_from_timer(self):
+        """Timer callback: flush, then drop the timer thread's connection"""
+        self.flush_feature_usage()
+        self._close_thread_conn()
+    
+    def flush_feature_usage(self):
+        """Write all buffered feature usage events in a single transaction"""
+        with self._usage_lock:
+            events, self._usage_buffer = self._usage_buffer, Counter()
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        
+        if not events:
+            return
         
-        conn.commit()
-        conn.close()
+        rows = [(feature_name, user_session, count)
+                for (feature_name, user_session), count in events.items()]
+        
+        with self._write_lock, self._conn() as conn:
+            conn.executemany('''
+                INSERT INTO feature_usage (feature_name, user_session, usage_count)
+                VALUES (?, ?, ?)
+                ON CONFLICT(feature_name, user_session) DO UPDATE SET
+                    usage_count = usage_count + excluded.usage_count,
+                    last_used = CURRENT_TIMESTAMP
+            ''', rows)
+            self._write_epoch += 1
+    
+    def get_recent_feedback(self, limit: int = 50, offset: int = 0) -> List[Tuple]:
+        """Get one page of (date, type, rating, comment) rows, newest first"""
+        cursor = self._conn().execute('''
+            SELECT DATE(timestamp), feedback_type, rating, comment
+            FROM user_feedback
+            ORDER BY timestamp DESC
+            LIMIT ? OFFSET ?
+        ''', (limit, offset))
+        return cursor.fetchall()
     
     def get_feedback_analytics(self, days: int = 30) -> Dict:
-        """Get feedback analytics for the last N days"""
-        conn = sqlite3.connect(self.db_path)
+        """Get feedback analytics for the last N days, cached until a write or TTL expiry"""
+        self.flush_feature_usage()
+        
+        cached = self._analytics_cache.get(days)
+        if (cached is not None and cached[1] == self._write_epoch
+                and time.monotonic() - cached[0] < self.ANALYTICS_CACHE_TTL):
+            return cached[2]
+        
+        epoch = self._write_epoch
+        analytics = self._query_feedback_analytics(days)
+        self._analytics_cache[days] = (time.monotonic(), epoch, analytics)
+        return analytics
+    
+    def _query_feedback_analytics(self, days: int) -> Dict:
+        """Run the analytics query for the last N days"""
+        conn = self._conn()
         cursor = conn.cursor()
         
         start_date = datetime.now() - timedelta(days=days)
         
-        # Overall feedback stats
-        cursor.execute('''
-            SELECT 
-                COUNT(*) as total_feedback,
-                AVG(rating) as avg_rating,
-                COUNT(CASE WHEN rating >= 4 THEN 1 END) as positive_feedback,
-                COUNT(CASE WHEN rating <= 2 THEN 1 END) as negative_feedback
-            FROM user_feedback 
-            WHERE timestamp >= ? AND rating IS NOT NULL
-        ''', (start_date,))
-        
-        overall_stats = cursor.fetchone()
-        
-        # Feature usage stats
-        cursor.execute('''
-            SELECT feature_name, SUM(usage_count) as total_usage
-            FROM feature_usage
-            WHERE last_used >= ?
-            GROUP BY feature_name
-            ORDER BY total_usage DESC
-        ''', (start_date,))
-        
-        feature_stats = cursor.fetchall()
-        
-        # Common feedback themes
+        # Overall stats, feature usage and common comments in one round-trip,
+        # sharing the windowed user_feedback scan; the first column tags each row
         cursor.execute('''
-            SELECT comment, COUNT(*) as frequency
-            FROM user_feedback
-            WHERE timestamp >= ? AND comment IS NOT NULL AND comment != ''
-            GROUP BY comment
-            ORDER BY frequency DESC
-            LIMIT 10
-        ''', (start_date,))
-        
-        common_feedback = cursor.fetchall()
-        
-        conn.close()
+            WITH fb AS (
+                SELECT rating, comment, comment_hash FROM user_feedback WHERE timestamp >= :start_date
+            )
+            SELECT 'overall', NULL,
+                COUNT(*),
+                AVG(rating),
+                COUNT(CASE WHEN rating >= 4 THEN 1 END),
+                COUNT(CASE WHEN rating <= 2 THEN 1 END)
+            FROM fb WHERE rating IS NOT NULL
+            UNION ALL
+            SELECT * FROM (
+                SELECT 'feature', feature_name, SUM(usage_count) AS total, NULL, NULL, NULL
+                FROM feature_usage
+                WHERE last_used >= :start_date
+                GROUP BY feature_name
+            )
+            UNION ALL
+            SELECT * FROM (
+                SELECT 'comment', MIN(comment), COUNT(*) AS frequency, NULL, NULL, NULL
+                FROM fb
+                WHERE comment_hash IS NOT NULL
+                GROUP BY comment_hash
+                ORDER BY frequency DESC
+                LIMIT 10
+            )
+            ORDER BY 1, 3 DESC
+        ''', {'start_date': start_date})
+        
+        # Rows arrive grouped by tag, most frequent first, so fill the dicts straight from the cursor
+        overall_stats = (0, 0, 0, 0)
+        feature_usage = {}
+        common_feedback = {}
+        for tag, name, count, avg_rating, positive, negative in cursor:
+            if tag == 'overall':
+                overall_stats = (count, avg_rating, positive, negative)
+            elif tag == 'feature':
+                feature_usage[name] = count
+            else:
+                common_feedback[name] = count
         
         return {
             'total_feedback': overall_stats[0] or 0,
             'avg_rating': overall_stats[1] or 0,
             'positive_feedback': overall_stats[2] or 0,
             'negative_feedback': overall_stats[3] or 0,
-            'feature_usage': dict(feature_stats),
-            'common_feedback': dict(common_feedback)
+            'feature_usage': feature_usage,
+            'common_feedback': common_feedback
         }
 
 class FeedbackCollector:
     """UI component for collecting user feedback"""
     
-    def __init__(self, parent_window, session_id: str = None):
+    def __init__(self, parent_window, session_id: str = None, db: Optional[FeedbackDatabase] = None):
         self.parent = parent_window
         self.session_id = session_id or str(uuid.uuid4())
-        self.db = FeedbackDatabase()
+        self.db = db or FeedbackDatabase()
         self.feedback_window = None
         
     def show_quick_feedback(self, message_id: str = None):
@@ -284,7 +481,7 @@ class FeedbackCollector:
         comment = self.comment_text.get("1.0", tk.END).strip()
         
         if message_id:
-            self.db.save_response_rating(message_id, rating, comment)
+            submit_background_write(self.db.save_response_rating, message_id, rating, comment)
         
         # Also save to general feedback
         feedback_data = {
@@ -294,7 +491,7 @@ class FeedbackCollector:
             'comment': comment
         }
         
-        self.db.save_feedback(feedback_data)
+        submit_background_write(self.db.save_feedback, feedback_data)
         
         # Show confirmation
         messagebox.showinfo("Thank You", "Your feedback has been submitted!")
@@ -404,7 +601,7 @@ class FeedbackCollector:
             'bug_report': self.bug_report_text.get("1.0", tk.END).strip()
         }
         
-        self.db.save_feedback(feedback_data)
+        submit_background_write(self.db.save_feedback, feedback_data)
         
         # Show confirmation
         messagebox.showinfo("Thank You", "Your detailed feedback has been submitted!")
@@ -413,10 +610,20 @@ class FeedbackCollector:
 class FeedbackAnalytics:
     """Analytics dashboard for feedback data"""
     
-    def __init__(self, parent_window):
+    # Rows fetched per page when scrolling the details tab
+    DETAILS_PAGE_SIZE = 50
+    # Delay that collapses repeated Refresh Data clicks into one reload
+    REFRESH_DEBOUNCE_MS = 300
+    
+    def __init__(self, parent_window, db: Optional[FeedbackDatabase] = None):
         self.parent = parent_window
-        self.db = FeedbackDatabase()
+        self.db = db or FeedbackDatabase()
         self.analytics_window = None
+        self.overview_text = None
+        self.details_tree = None
+        self._details_offset = 0  # rows of recent feedback already in the details tree
+        self._details_exhausted = False
+        self._refresh_job = None
     
     def show_analytics_dashboard(self):
         """Show analytics dashboard"""
@@ -466,6 +673,12 @@ class FeedbackAnalytics:
     
     def load_overview_analytics(self, frame):
         """Load overview analytics"""
+        self.overview_text = tk.Text(frame, wrap=tk.WORD, font=("Arial", 10))
+        self.overview_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.update_overview_analytics()
+    
+    def update_overview_analytics(self):
+        """Rewrite the overview text from the current analytics"""
         analytics = self.db.get_feedback_analytics(days=30)
         
         # Create overview widgets
@@ -490,10 +703,10 @@ Negative Feedback: {analytics['negative_feedback']}
         for comment, freq in list(analytics['common_feedback'].items())[:5]:
             overview_text += f"• {comment[:50]}{'...' if len(comment) > 50 else ''}: {freq} times\n"
         
-        text_widget = tk.Text(frame, wrap=tk.WORD, font=("Arial", 10))
-        text_widget.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        text_widget.insert(tk.END, overview_text)
-        text_widget.config(state=tk.DISABLED)
+        self.overview_text.config(state=tk.NORMAL)
+        self.overview_text.delete('1.0', tk.END)
+        self.overview_text.insert(tk.END, overview_text)
+        self.overview_text.config(state=tk.DISABLED)
     
     def load_trends_analytics(self, frame):
         """Load trends analytics"""
@@ -531,34 +744,59 @@ or plotly to show visual trends)
             tree.heading(col, text=col)
             tree.column(col, width=150)
         
-        # Load recent feedback
-        conn = sqlite3.connect(self.db.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT DATE(timestamp), feedback_type, rating, comment
-            FROM user_feedback
-            ORDER BY timestamp DESC
-            LIMIT 50
-        ''')
+        # Scrollbar for treeview; the next page is fetched when the view reaches the end
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
         
-        for row in cursor.fetchall():
-            tree.insert('', 'end', values=row)
+        def on_scroll(first, last):
+            scrollbar.set(first, last)
+            if float(last) >= 1.0:
+                self.load_details_page(tree)
         
-        conn.close()
+        tree.configure(yscrollcommand=on_scroll)
         
-        # Scrollbar for treeview
-        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
+        self.details_tree = tree
+        self.reload_details_analytics()
         
         tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10, pady=10)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y, pady=10)
     
+    def reload_details_analytics(self):
+        """Clear the details tree and load the first page of recent feedback"""
+        self.details_tree.delete(*self.details_tree.get_children())
+        self._details_offset = 0
+        self._details_exhausted = False
+        self.load_details_page(self.details_tree)
+    
+    def load_details_page(self, tree):
+        """Append the next page of recent feedback to the details tree"""
+        if self._details_exhausted:
+            return
+        
+        rows = self.db.get_recent_feedback(self.DETAILS_PAGE_SIZE, self._details_offset)
+        for row in rows:
+            tree.insert('', 'end', values=row)
+        
+        self._details_offset += len(rows)
+        self._details_exhausted = len(rows) < self.DETAILS_PAGE_SIZE
+    
     def refresh_analytics(self):
-        """Refresh analytics data"""
-        if self.analytics_window and self.analytics_window.winfo_exists():
-            self.analytics_window.destroy()
-        self.show_analytics_dashboard()
+        """Refresh analytics data, debounced so rapid clicks reload once"""
+        if not (self.analytics_window and self.analytics_window.winfo_exists()):
+            self.show_analytics_dashboard()
+            return
+        
+        if self._refresh_job is not None:
+            self.analytics_window.after_cancel(self._refresh_job)
+        self._refresh_job = self.analytics_window.after(self.REFRESH_DEBOUNCE_MS,
+                                                        self._refresh_in_place)
+    
+    def _refresh_in_place(self):
+        """Re-populate the open dashboard's widgets without rebuilding them"""
+        self._refresh_job = None
+        if not (self.analytics_window and self.analytics_window.winfo_exists()):
+            return
+        self.update_overview_analytics()
+        self.reload_details_analytics()
 
 # Example integration with main application
 class FeedbackIntegration:
@@ -567,9 +805,11 @@ class FeedbackIntegration:
     def __init__(self, main_app):
         self.main_app = main_app
         self.session_id = str(uuid.uuid4())
-        self.collector = FeedbackCollector(main_app.root, self.session_id)
-        self.analytics = FeedbackAnalytics(main_app.root)
+        # One database shared by the collector and dashboard: a single schema check,
+        # one connection per thread, and a common usage buffer and analytics cache
         self.db = FeedbackDatabase()
+        self.collector = FeedbackCollector(main_app.root, self.session_id, db=self.db)
+        self.analytics = FeedbackAnalytics(main_app.root, db=self.db)
         
         # Add feedback menu to main app
         self.add_feedback_menu()
@@ -615,9 +855,10 @@ if __name__ == "__main__":
     ttk.Label(main_frame, text="Feedback System Test", 
              font=("Arial", 14, "bold")).pack(pady=(0, 20))
     
-    # Create feedback system
-    collector = FeedbackCollector(root)
-    analytics = FeedbackAnalytics(root)
+    # Create feedback system; the demo keeps its data in memory
+    db = FeedbackDatabase(":memory:")
+    collector = FeedbackCollector(root, db=db)
+    analytics = FeedbackAnalytics(root, db=db)
     
     # Test buttons
     ttk.Button(main_frame, text="Quick Feedback", 
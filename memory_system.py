@@ -18,15 +18,23 @@ Version: 1.0.0
 """
 
 import os
+import re
 import json
 import numpy as np
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, asdict
-from collections import defaultdict
+from dataclasses import dataclass
+from collections import defaultdict, OrderedDict
 import hashlib
 import pickle
+import importlib.util
+import base64
+import threading
+import time
+import itertools
+import platform
+from functools import lru_cache
 
 # Try to import ChromaDB for vector storage
 try:
@@ -45,8 +53,16 @@ except ImportError:
     SENTENCE_TRANSFORMERS_AVAILABLE = False
     print("⚠️ SentenceTransformers not available. Install with: pip install sentence-transformers")
 
+# ONNX Runtime lets SentenceTransformers run the int8-quantized model graph
+ONNXRUNTIME_AVAILABLE = importlib.util.find_spec("onnxruntime") is not None
+
 logger = logging.getLogger(__name__)
 
+# Sequence mixed into memory IDs so equal content stored in the same tick still differs
+_memory_id_sequence = itertools.count()
+
+_WORD_RE = re.compile(r"\w+")
+
 @dataclass
 class MemoryEntry:
     """Represents a single memory entry in the system"""
@@ -60,21 +76,191 @@ class MemoryEntry:
     embedding: Optional[List[float]] = None
     access_count: int = 0
     last_accessed: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow field dict; unlike dataclasses.asdict it doesn't deep-copy tags/metadata"""
+        return dict(self.__dict__)
+
+@lru_cache(maxsize=None)
+def _load_sentence_transformer(model_name: str, onnx_file: Optional[str] = None,
+                               num_threads: Optional[int] = None):
+    """Load a SentenceTransformer once per process so memory systems share its weights
+    
+    num_threads, when given, sizes the ONNX Runtime session or torch's intra-op pool.
+    """
+    if onnx_file:
+        model_kwargs = {"file_name": onnx_file}
+        if num_threads:
+            import onnxruntime
+            session_options = onnxruntime.SessionOptions()
+            session_options.intra_op_num_threads = num_threads
+            model_kwargs["session_options"] = session_options
+        return SentenceTransformer(model_name, backend="onnx", model_kwargs=model_kwargs)
+    
+    if num_threads:
+        import torch
+        torch.set_num_threads(num_threads)
+        try:
+            torch.set_num_interop_threads(2)
+        except RuntimeError:
+            pass  # Only settable before torch runs parallel work
+    return SentenceTransformer(model_name)
+
+def _cpu_flags() -> frozenset:
+    """x86 feature flags from /proc/cpuinfo; empty where that isn't available"""
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    return frozenset(line.split(":", 1)[1].split())
+    except OSError:
+        pass
+    return frozenset()
+
+@lru_cache(maxsize=None)
+def _default_onnx_model_file() -> str:
+    """Int8 ONNX export of the embedding model tuned for this machine's CPU"""
+    machine = platform.machine().lower()
+    if machine in ("arm64", "aarch64"):
+        return "onnx/model_qint8_arm64.onnx"
+    if machine not in ("x86_64", "amd64", "i386", "i686", "x86"):
+        return "onnx/model.onnx"  # Unquantized graph for other architectures
+    flags = _cpu_flags()
+    if "avx512_vnni" in flags:
+        return "onnx/model_qint8_avx512_vnni.onnx"
+    if "avx512f" in flags:
+        return "onnx/model_qint8_avx512.onnx"
+    # AVX2 is the baseline on current x86, and the only safe pick when flags are unknown
+    return "onnx/model_quint8_avx2.onnx"
+
+# Chroma stores metadata values of these types natively
+_CHROMA_SCALAR_TYPES = (str, int, float, bool)
+# Prefix for user metadata keys flattened into a Chroma metadata dict
+_CHROMA_META_PREFIX = "meta_"
+
+def _to_chroma_metadata(memory_entry: "MemoryEntry") -> Dict[str, Any]:
+    """Chroma metadata for an entry: tags as a JSON list, scalar metadata flattened"""
+    chroma_metadata = {
+        "id": memory_entry.id,
+        "timestamp": memory_entry.timestamp,
+        "memory_type": memory_entry.memory_type,
+        "importance": memory_entry.importance,
+        "tags": json.dumps(memory_entry.tags),
+        "access_count": memory_entry.access_count
+    }
+    
+    # Only values Chroma can't hold natively are JSON-encoded
+    nested = {}
+    for key, value in memory_entry.metadata.items():
+        if isinstance(value, _CHROMA_SCALAR_TYPES):
+            chroma_metadata[_CHROMA_META_PREFIX + key] = value
+        else:
+            nested[key] = value
+    if nested:
+        chroma_metadata["metadata"] = json.dumps(nested)
+    
+    return chroma_metadata
+
+def _from_chroma_metadata(chroma_metadata: Dict[str, Any]) -> Tuple[List[str], Dict[str, Any]]:
+    """Recover (tags, metadata) from a Chroma metadata dict"""
+    tags = json.loads(chroma_metadata.get('tags', '[]'))
+    
+    metadata = json.loads(chroma_metadata['metadata']) if 'metadata' in chroma_metadata else {}
+    for key, value in chroma_metadata.items():
+        if key.startswith(_CHROMA_META_PREFIX):
+            metadata[key[len(_CHROMA_META_PREFIX):]] = value
+    
+    return tags, metadata
+
+def quantize_embedding(embedding: List[float]) -> Dict[str, Any]:
+    """Absmax-quantize an embedding to int8, returning base64 bytes and the scale"""
+    vector = np.asarray(embedding, dtype=np.float32)
+    scale = float(np.max(np.abs(vector))) / 127.0 or 1.0
+    quantized = np.round(vector / scale).astype(np.int8)
+    return {"q": base64.b64encode(quantized.tobytes()).decode("ascii"), "scale": scale}
+
+def dequantize_embedding(embedding: Any) -> Optional[List[float]]:
+    """Inverse of quantize_embedding; plain float lists and None pass through"""
+    if not isinstance(embedding, dict):
+        return embedding
+    quantized = np.frombuffer(base64.b64decode(embedding["q"]), dtype=np.int8)
+    return (quantized.astype(np.float32) * embedding["scale"]).tolist()
 
 class AdvancedMemorySystem:
     """Advanced memory system with vector database and semantic search"""
     
-    def __init__(self, memory_dir: str = "memory_db"):
+    # Model used for embeddings, and an override for its ONNX export; None picks
+    # the int8 variant for this CPU (arm64, AVX2, AVX-512 or AVX-512 VNNI)
+    EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+    ONNX_MODEL_FILE: Optional[str] = None
+    # Texts per encoder forward pass, and rows per ChromaDB add call
+    EMBEDDING_BATCH_SIZE = 64
+    CHROMA_BATCH_SIZE = 256
+    # HNSW settings for new collections, sized for 1k-100k memories: smaller graph
+    # degree and build effort than Chroma's defaults, slightly wider search
+    DEFAULT_HNSW_PARAMS = {
+        "hnsw:space": "ip",
+        "hnsw:M": 12,
+        "hnsw:construction_ef": 64,
+        "hnsw:search_ef": 32,
+        "hnsw:num_threads": os.cpu_count() or 1
+    }
+    # Rows per collection.get page, and ids per collection.delete call
+    CHROMA_PAGE_SIZE = 10000
+    CHROMA_DELETE_BATCH = 1000
+    # Most recent embeddings kept, keyed by a hash of the encoded text
+    EMBEDDING_CACHE_SIZE = 4096
+    # Fallback log size (chars) below which it is never compacted into the snapshot
+    FALLBACK_LOG_MIN_COMPACT = 1 << 20
+    
+    def __init__(self, memory_dir: str = "memory_db", use_onnx: Optional[bool] = None,
+                 embedding_dtype: str = "float32", preload: bool = False,
+                 configure_threads: bool = True, hnsw_params: Optional[Dict[str, Any]] = None):
         self.memory_dir = memory_dir
+        # "int8" stores fallback embeddings quantized (~4x smaller JSON); ChromaDB keeps float32
+        self.embedding_dtype = embedding_dtype
+        # Quantized ONNX embeddings are on by default; ETHER_EMBEDDING_ONNX=0 opts out
+        if use_onnx is None:
+            use_onnx = os.environ.get("ETHER_EMBEDDING_ONNX", "1") != "0"
+        self.use_onnx = use_onnx and ONNXRUNTIME_AVAILABLE
+        # Some torch builds default to a single intra-op thread; size the pool to the CPU
+        self.configure_threads = configure_threads
+        # Overrides for DEFAULT_HNSW_PARAMS; they only apply when the collection is created
+        self.hnsw_params = {**self.DEFAULT_HNSW_PARAMS, **(hnsw_params or {})}
+        self._hnsw_params_requested = hnsw_params is not None
         self.collection_name = "ether_memory"
-        self.embedding_model = None
+        # The model is loaded on first use of the embedding_model property
+        self._embedding_model = None
+        self._embedding_model_loaded = False
+        self._embedding_model_lock = threading.Lock()
         self.chroma_client = None
         self.collection = None
-        self.memory_cache = {}
+        self.memory_cache: "OrderedDict[str, MemoryEntry]" = OrderedDict()  # LRU order
         self.max_cache_size = 1000
+        self._emb_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
         
         # Initialize the system
         self._initialize_system()
+        
+        # Optionally warm the model up off the calling thread
+        if preload and SENTENCE_TRANSFORMERS_AVAILABLE:
+            threading.Thread(target=lambda: self.embedding_model, name="embedding-preload",
+                             daemon=True).start()
+    
+    @property
+    def embedding_model(self):
+        """Sentence transformer used for embeddings, loaded on first access"""
+        if not self._embedding_model_loaded and SENTENCE_TRANSFORMERS_AVAILABLE:
+            with self._embedding_model_lock:
+                if not self._embedding_model_loaded:
+                    self._initialize_embedding_model()
+                    self._embedding_model_loaded = True
+        return self._embedding_model
+    
+    @embedding_model.setter
+    def embedding_model(self, model):
+        self._embedding_model = model
+        self._embedding_model_loaded = True
     
     def _initialize_system(self):
         """Initialize the memory system components"""
@@ -89,10 +275,8 @@ class AdvancedMemorySystem:
                 logger.warning("ChromaDB not available. Using fallback memory system.")
                 self._initialize_fallback()
             
-            # Initialize embedding model if available
-            if SENTENCE_TRANSFORMERS_AVAILABLE:
-                self._initialize_embedding_model()
-            else:
+            # The embedding model itself is loaded lazily by the embedding_model property
+            if not SENTENCE_TRANSFORMERS_AVAILABLE:
                 logger.warning("SentenceTransformers not available. Using basic similarity.")
                 
             logger.info("✅ Advanced Memory System initialized successfully")
@@ -114,10 +298,13 @@ class AdvancedMemorySystem:
             try:
                 self.collection = self.chroma_client.get_collection(self.collection_name)
                 logger.info(f"✅ Connected to existing memory collection: {self.collection_name}")
+                self._warn_on_hnsw_mismatch()
             except:
+                # Embeddings are unit length, so the default "ip" space ranks like
+                # cosine without the per-distance normalization
                 self.collection = self.chroma_client.create_collection(
                     name=self.collection_name,
-                    metadata={"description": "Ether AI Memory System"}
+                    metadata={"description": "Ether AI Memory System", **self.hnsw_params}
                 )
                 logger.info(f"✅ Created new memory collection: {self.collection_name}")
                 
@@ -125,170 +312,382 @@ class AdvancedMemorySystem:
             logger.error(f"❌ ChromaDB initialization failed: {e}")
             raise
     
+    def _warn_on_hnsw_mismatch(self):
+        """Warn when an existing collection was built with different HNSW settings than requested"""
+        existing = self.collection.metadata or {}
+        mismatched = {key: existing.get(key) for key, value in self.hnsw_params.items()
+                      if key != "hnsw:num_threads" and existing.get(key) != value}
+        if mismatched:
+            # Collections created before the tuned defaults always differ; only
+            # settings the caller asked for are worth a warning
+            log = logger.warning if self._hnsw_params_requested else logger.debug
+            log(f"Memory collection keeps its original HNSW settings {mismatched}; "
+                f"{self.hnsw_params} only apply to new collections")
+    
     def _initialize_fallback(self):
         """Initialize fallback memory system (JSON-based)"""
         self.fallback_memory_file = os.path.join(self.memory_dir, "fallback_memory.json")
+        self.fallback_log_file = os.path.join(self.memory_dir, "fallback_memory.log")
         self.fallback_memory = self._load_fallback_memory()
+        self._rebuild_fallback_index()
         logger.info("✅ Fallback memory system initialized")
     
+    def _rebuild_fallback_index(self):
+        """Rebuild the word -> memory position index and embedding matrix over the fallback store"""
+        self._inv_index: Dict[str, set] = defaultdict(set)
+        self._content_lower: List[str] = []
+        # Normalized embeddings as contiguous rows (grown by doubling) for one GEMV per search
+        self._emb_matrix: Optional[np.ndarray] = None
+        self._emb_rows: List[int] = []  # matrix row -> memory position
+        for memory_dict in self.fallback_memory["memories"]:
+            self._index_fallback_memory(memory_dict)
+    
+    def _index_fallback_memory(self, memory_dict: Dict):
+        """Add the fallback memory at the next position to the inverted index"""
+        position = len(self._content_lower)
+        content_lower = memory_dict.get("content", "").lower()
+        self._content_lower.append(content_lower)
+        for word in set(_WORD_RE.findall(content_lower)):
+            self._inv_index[word].add(position)
+        
+        embedding = dequantize_embedding(memory_dict.get("embedding"))
+        if embedding:
+            self._append_embedding_row(position, embedding)
+    
+    def _append_embedding_row(self, position: int, embedding: List[float]):
+        """Append a normalized embedding row for the fallback memory at position"""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        
+        count = len(self._emb_rows)
+        if self._emb_matrix is None:
+            self._emb_matrix = np.empty((64, vector.size), dtype=np.float32)
+        elif vector.size != self._emb_matrix.shape[1]:
+            logger.warning(f"Skipping embedding with dimension {vector.size} for fallback search")
+            return
+        elif count == self._emb_matrix.shape[0]:
+            grown = np.empty((count * 2, vector.size), dtype=np.float32)
+            grown[:count] = self._emb_matrix
+            self._emb_matrix = grown
+        
+        self._emb_matrix[count] = vector
+        self._emb_rows.append(position)
+    
     def _initialize_embedding_model(self):
         """Initialize sentence transformer model for embeddings"""
+        model_name = self.EMBEDDING_MODEL_NAME  # Fast, efficient model
+        num_threads = min(os.cpu_count() or 1, 8) if self.configure_threads else None
+        if self.use_onnx:
+            try:
+                onnx_file = self.ONNX_MODEL_FILE or _default_onnx_model_file()
+                self._embedding_model = _load_sentence_transformer(model_name, onnx_file, num_threads)
+                logger.info(f"✅ Embedding model loaded: {model_name} (ONNX {onnx_file})")
+                return
+            except Exception as e:
+                logger.warning(f"ONNX embedding backend unavailable, using PyTorch: {e}")
+        
         try:
-            model_name = "all-MiniLM-L6-v2"  # Fast, efficient model
-            self.embedding_model = SentenceTransformer(model_name)
+            self._embedding_model = _load_sentence_transformer(model_name, num_threads=num_threads)
             logger.info(f"✅ Embedding model loaded: {model_name}")
         except Exception as e:
             logger.error(f"❌ Failed to load embedding model: {e}")
-            self.embedding_model = None
+            self._embedding_model = None
     
     def _load_fallback_memory(self) -> Dict:
-        """Load fallback memory from JSON file"""
+        """Load the fallback memory snapshot and replay the append log on top"""
+        fallback_memory = None
         if os.path.exists(self.fallback_memory_file):
             try:
                 with open(self.fallback_memory_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                    fallback_memory = json.load(f)
             except Exception as e:
                 logger.error(f"Failed to load fallback memory: {e}")
-        return {"memories": [], "metadata": {"created": datetime.now().isoformat()}}
+        if fallback_memory is None:
+            fallback_memory = {"memories": [], "metadata": {"created": datetime.now().isoformat()}}
+        
+        self._fallback_log_size = 0
+        if os.path.exists(self.fallback_log_file):
+            try:
+                # Skip ids already in the snapshot in case a compaction was interrupted
+                known_ids = {memory.get("id") for memory in fallback_memory["memories"]}
+                with open(self.fallback_log_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        self._fallback_log_size += len(line)
+                        if not line.strip():
+                            continue
+                        try:
+                            memory_dict = json.loads(line)
+                        except json.JSONDecodeError as e:
+                            # A torn write from an interrupted append; later records are intact
+                            logger.warning(f"Skipping unreadable fallback log record: {e}")
+                            continue
+                        if memory_dict.get("id") not in known_ids:
+                            fallback_memory["memories"].append(memory_dict)
+            except Exception as e:
+                logger.error(f"Failed to replay fallback memory log: {e}")
+        
+        return fallback_memory
     
     def _save_fallback_memory(self):
-        """Save fallback memory to JSON file"""
+        """Write a full fallback memory snapshot and truncate the append log"""
         try:
-            with open(self.fallback_memory_file, 'w', encoding='utf-8') as f:
+            temp_file = self.fallback_memory_file + ".tmp"
+            with open(temp_file, 'w', encoding='utf-8') as f:
                 json.dump(self.fallback_memory, f, indent=2, ensure_ascii=False)
+            os.replace(temp_file, self.fallback_memory_file)
+            
+            open(self.fallback_log_file, 'w').close()
+            self._fallback_log_size = 0
         except Exception as e:
             logger.error(f"Failed to save fallback memory: {e}")
     
+    def _append_fallback_log(self, memory_dicts: List[Dict]):
+        """Append new memories to the log, compacting once it outgrows the snapshot"""
+        lines = "".join(json.dumps(memory_dict, ensure_ascii=False, separators=(',', ':')) + "\n"
+                        for memory_dict in memory_dicts)
+        with open(self.fallback_log_file, 'a+b') as f:
+            # Terminate a torn last record so it can't swallow the first new one
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    lines = "\n" + lines
+            f.write(lines.encode('utf-8'))
+        self._fallback_log_size += len(lines)
+        
+        snapshot_size = os.path.getsize(self.fallback_memory_file) if os.path.exists(self.fallback_memory_file) else 0
+        if self._fallback_log_size > max(2 * snapshot_size, self.FALLBACK_LOG_MIN_COMPACT):
+            self._save_fallback_memory()
+    
+    @staticmethod
+    def _embedding_cache_key(text: str) -> bytes:
+        """Digest identifying a text in the embedding cache"""
+        return hashlib.blake2b(text.encode(), digest_size=16).digest()
+    
+    def _cache_embedding(self, key: bytes, embedding: np.ndarray):
+        """Remember an embedding, evicting the least recently used past the cap"""
+        self._emb_cache[key] = embedding.astype(np.float32, copy=False)
+        if len(self._emb_cache) > self.EMBEDDING_CACHE_SIZE:
+            self._emb_cache.popitem(last=False)
+    
     def _generate_embedding(self, text: str) -> Optional[List[float]]:
         """Generate embedding for text using sentence transformer"""
-        if not self.embedding_model:
-            return None
+        return self._generate_embeddings([text])[0]
+    
+    def _generate_embeddings(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Generate embeddings for many texts, encoding only those not already cached
         
-        try:
-            embedding = self.embedding_model.encode(text).tolist()
-            return embedding
-        except Exception as e:
-            logger.error(f"Failed to generate embedding: {e}")
-            return None
+        Embeddings are L2-normalized by the encoder. The "ip" Chroma space relies
+        on this, so anything writing vectors to the collection must keep it.
+        """
+        if not self.embedding_model or not texts:
+            return [None] * len(texts)
+        
+        keys = [self._embedding_cache_key(text) for text in texts]
+        embeddings = [None] * len(texts)
+        missing = {}  # key -> first index of an uncached text
+        for i, key in enumerate(keys):
+            cached = self._emb_cache.get(key)
+            if cached is not None:
+                self._emb_cache.move_to_end(key)
+                embeddings[i] = cached
+            else:
+                missing.setdefault(key, i)
+        
+        if missing:
+            try:
+                encoded = self.embedding_model.encode(
+                    [texts[i] for i in missing.values()],
+                    batch_size=self.EMBEDDING_BATCH_SIZE, convert_to_numpy=True,
+                    normalize_embeddings=True
+                )
+            except Exception as e:
+                logger.error(f"Failed to generate embeddings: {e}")
+                encoded = None
+            if encoded is not None:
+                fresh = dict(zip(missing, encoded))
+                for key, embedding in fresh.items():
+                    self._cache_embedding(key, embedding)
+                embeddings = [fresh[key] if embedding is None else embedding
+                              for key, embedding in zip(keys, embeddings)]
+        
+        # Lists only at the storage boundary; the cache keeps compact float32 arrays
+        return [None if embedding is None else embedding.tolist() for embedding in embeddings]
+    
+    # Importance multiplier per memory type; other types use DEFAULT_TYPE_WEIGHT
+    TYPE_WEIGHTS = {
+        'preference': 0.9,
+        'fact': 0.8,
+        'conversation': 0.6,
+        'context': 0.4
+    }
+    DEFAULT_TYPE_WEIGHT = 0.5
     
     def _calculate_importance(self, content: str, memory_type: str, metadata: Dict) -> float:
         """Calculate importance score for a memory entry"""
-        importance = 0.5  # Base importance
+        return float(self._calculate_importance_batch([content], [memory_type], [metadata])[0])
+    
+    def _calculate_importance_batch(self, contents: List[str], memory_types: List[str],
+                                    metadatas: List[Dict]) -> np.ndarray:
+        """Calculate importance scores for many memory entries at once"""
+        count = len(contents)
+        lengths = np.fromiter((len(content) for content in contents), dtype=np.int64, count=count)
+        type_weights = np.fromiter(
+            (self.TYPE_WEIGHTS.get(memory_type, self.DEFAULT_TYPE_WEIGHT) for memory_type in memory_types),
+            dtype=np.float64, count=count
+        )
+        ratings = np.fromiter((metadata.get('user_rating') or 0 for metadata in metadatas),
+                              dtype=np.float64, count=count)
+        frequencies = np.fromiter((metadata.get('frequency', 0) or 0 for metadata in metadatas),
+                                  dtype=np.float64, count=count)
         
-        # Adjust based on memory type
-        type_weights = {
-            'preference': 0.9,
-            'fact': 0.8,
-            'conversation': 0.6,
-            'context': 0.4
-        }
-        importance *= type_weights.get(memory_type, 0.5)
+        # Base importance scaled by memory type
+        importance = 0.5 * type_weights
         
         # Adjust based on content length (longer = more important)
-        if len(content) > 500:
-            importance += 0.2
-        elif len(content) > 100:
-            importance += 0.1
+        importance += np.where(lengths > 500, 0.2, np.where(lengths > 100, 0.1, 0.0))
         
         # Adjust based on metadata
-        if metadata.get('user_rating'):
-            importance += metadata['user_rating'] * 0.3
+        importance += ratings * 0.3
+        importance += np.where(frequencies > 1, np.minimum(frequencies * 0.1, 0.3), 0.0)
+        
+        return np.minimum(importance, 1.0)
+    
+    def _build_memory_entry(self, content: str, memory_type: str = "conversation",
+                            tags: List[str] = None, metadata: Dict = None,
+                            timestamp: Optional[str] = None,
+                            importance: Optional[float] = None) -> MemoryEntry:
+        """Create a MemoryEntry with its ID and importance filled in"""
+        timestamp = timestamp or datetime.now().isoformat()
         
-        if metadata.get('frequency', 0) > 1:
-            importance += min(metadata['frequency'] * 0.1, 0.3)
+        # Generate unique 64-bit ID from the content, a ns clock and a sequence number
+        id_hash = hashlib.blake2b(content.encode(), digest_size=8)
+        id_hash.update(f"{time.time_ns()}:{next(_memory_id_sequence)}".encode())
+        memory_id = id_hash.hexdigest()
         
-        return min(importance, 1.0)
+        # Prepare data
+        tags = tags or []
+        metadata = metadata or {}
+        
+        # Calculate importance
+        if importance is None:
+            importance = self._calculate_importance(content, memory_type, metadata)
+        
+        return MemoryEntry(
+            id=memory_id,
+            content=content,
+            timestamp=timestamp,
+            memory_type=memory_type,
+            importance=importance,
+            tags=tags,
+            metadata=metadata
+        )
     
     def store_memory(self, content: str, memory_type: str = "conversation", 
                     tags: List[str] = None, metadata: Dict = None) -> str:
         """Store a memory entry in the system"""
+        memory_ids = self.store_memories_bulk([{
+            "content": content,
+            "memory_type": memory_type,
+            "tags": tags,
+            "metadata": metadata
+        }])
+        return memory_ids[0] if memory_ids else None
+    
+    def store_memories_bulk(self, items: List[Dict]) -> List[str]:
+        """Store many memories with one batched encode and one write per backend batch
+        
+        Each item is a dict with ``content`` and optional ``memory_type``, ``tags``
+        and ``metadata`` keys, mirroring the store_memory arguments.
+        """
         try:
-            # Generate unique ID
-            memory_id = hashlib.md5(f"{content}{datetime.now().isoformat()}".encode()).hexdigest()[:16]
-            
-            # Prepare data
-            tags = tags or []
-            metadata = metadata or {}
+            # One wall-clock timestamp and one vectorized importance pass for the whole batch
             timestamp = datetime.now().isoformat()
+            memory_types = [item.get("memory_type") or "conversation" for item in items]
+            metadatas = [item.get("metadata") or {} for item in items]
+            importances = self._calculate_importance_batch(
+                [item["content"] for item in items], memory_types, metadatas
+            ) if items else []
+            memory_entries = [
+                self._build_memory_entry(
+                    item["content"],
+                    memory_type,
+                    item.get("tags"),
+                    metadata,
+                    timestamp,
+                    float(importance)
+                )
+                for item, memory_type, metadata, importance in zip(items, memory_types, metadatas, importances)
+            ]
             
-            # Calculate importance
-            importance = self._calculate_importance(content, memory_type, metadata)
-            
-            # Create memory entry
-            memory_entry = MemoryEntry(
-                id=memory_id,
-                content=content,
-                timestamp=timestamp,
-                memory_type=memory_type,
-                importance=importance,
-                tags=tags,
-                metadata=metadata
-            )
-            
-            # Generate embedding
-            embedding = self._generate_embedding(content)
-            if embedding:
-                memory_entry.embedding = embedding
+            # Generate embeddings in one batched forward pass
+            embeddings = self._generate_embeddings([entry.content for entry in memory_entries])
+            for memory_entry, embedding in zip(memory_entries, embeddings):
+                if embedding:
+                    memory_entry.embedding = embedding
             
             # Store in ChromaDB if available
             if self.collection:
-                self._store_in_chromadb(memory_entry)
+                for start in range(0, len(memory_entries), self.CHROMA_BATCH_SIZE):
+                    self._store_in_chromadb(memory_entries[start:start + self.CHROMA_BATCH_SIZE])
             else:
-                self._store_in_fallback(memory_entry)
+                self._store_in_fallback(memory_entries)
             
             # Update cache
-            self._update_cache(memory_entry)
+            for memory_entry in memory_entries:
+                self._update_cache(memory_entry)
+                logger.info(f"✅ Memory stored: {memory_entry.id} ({memory_entry.memory_type})")
             
-            logger.info(f"✅ Memory stored: {memory_id} ({memory_type})")
-            return memory_id
+            return [memory_entry.id for memory_entry in memory_entries]
             
         except Exception as e:
             logger.error(f"❌ Failed to store memory: {e}")
-            return None
+            return []
     
-    def _store_in_chromadb(self, memory_entry: MemoryEntry):
-        """Store memory entry in ChromaDB"""
+    def _store_in_chromadb(self, memory_entries: List[MemoryEntry]):
+        """Store memory entries in ChromaDB with a single add call"""
+        # Hand over our own embeddings so Chroma doesn't re-embed the documents;
+        # it only falls back to its embedder when some vectors are missing
+        embeddings = [memory_entry.embedding for memory_entry in memory_entries]
+        if any(embedding is None for embedding in embeddings):
+            embeddings = None
+        
         try:
             self.collection.add(
-                documents=[memory_entry.content],
-                metadatas=[{
-                    "id": memory_entry.id,
-                    "timestamp": memory_entry.timestamp,
-                    "memory_type": memory_entry.memory_type,
-                    "importance": memory_entry.importance,
-                    "tags": json.dumps(memory_entry.tags),
-                    "metadata": json.dumps(memory_entry.metadata),
-                    "access_count": memory_entry.access_count
-                }],
-                ids=[memory_entry.id]
+                documents=[memory_entry.content for memory_entry in memory_entries],
+                embeddings=embeddings,
+                metadatas=[_to_chroma_metadata(memory_entry) for memory_entry in memory_entries],
+                ids=[memory_entry.id for memory_entry in memory_entries]
             )
         except Exception as e:
             logger.error(f"Failed to store in ChromaDB: {e}")
             raise
     
-    def _store_in_fallback(self, memory_entry: MemoryEntry):
-        """Store memory entry in fallback system"""
+    def _store_in_fallback(self, memory_entries: List[MemoryEntry]):
+        """Store memory entries in fallback system with a single log append"""
         try:
-            memory_dict = asdict(memory_entry)
-            self.fallback_memory["memories"].append(memory_dict)
-            self._save_fallback_memory()
+            memory_dicts = []
+            for memory_entry in memory_entries:
+                memory_dict = memory_entry.to_dict()
+                if self.embedding_dtype == "int8" and memory_dict["embedding"] is not None:
+                    memory_dict["embedding"] = quantize_embedding(memory_dict["embedding"])
+                self.fallback_memory["memories"].append(memory_dict)
+                self._index_fallback_memory(memory_dict)
+                memory_dicts.append(memory_dict)
+            self._append_fallback_log(memory_dicts)
         except Exception as e:
             logger.error(f"Failed to store in fallback: {e}")
             raise
     
     def _update_cache(self, memory_entry: MemoryEntry):
-        """Update memory cache with new entry"""
+        """Update memory cache with new entry, evicting the least recently used"""
         self.memory_cache[memory_entry.id] = memory_entry
+        self.memory_cache.move_to_end(memory_entry.id)
         
         # Manage cache size
-        if len(self.memory_cache) > self.max_cache_size:
-            # Remove oldest entries
-            oldest_entries = sorted(
-                self.memory_cache.items(),
-                key=lambda x: x[1].last_accessed or x[1].timestamp
-            )
-            for old_id, _ in oldest_entries[:self.max_cache_size // 4]:
-                del self.memory_cache[old_id]
+        while len(self.memory_cache) > self.max_cache_size:
+            self.memory_cache.popitem(last=False)
     
     def search_memories(self, query: str, memory_type: str = None, 
                        limit: int = 10, min_importance: float = 0.0) -> List[MemoryEntry]:
@@ -312,17 +711,24 @@ class AdvancedMemorySystem:
             if min_importance > 0:
                 where_clause["importance"] = {"$gte": min_importance}
             
-            # Search
+            # Search with our own query embedding when the model is loaded
+            query_embedding = self._generate_embedding(query)
+            if query_embedding is not None:
+                query_args = {"query_embeddings": [query_embedding]}
+            else:
+                query_args = {"query_texts": [query]}
+            
             results = self.collection.query(
-                query_texts=[query],
                 n_results=limit,
-                where=where_clause if where_clause else None
+                where=where_clause if where_clause else None,
+                **query_args
             )
             
             # Convert results to MemoryEntry objects
             memories = []
             for i, doc in enumerate(results['documents'][0]):
                 metadata = results['metadatas'][0][i]
+                tags, entry_metadata = _from_chroma_metadata(metadata)
                 
                 memory_entry = MemoryEntry(
                     id=metadata['id'],
@@ -330,8 +736,8 @@ class AdvancedMemorySystem:
                     timestamp=metadata['timestamp'],
                     memory_type=metadata['memory_type'],
                     importance=metadata['importance'],
-                    tags=json.loads(metadata.get('tags', '[]')),
-                    metadata=json.loads(metadata.get('metadata', '{}')),
+                    tags=tags,
+                    metadata=entry_metadata,
                     access_count=metadata.get('access_count', 0)
                 )
                 
@@ -339,6 +745,10 @@ class AdvancedMemorySystem:
                 memory_entry.last_accessed = datetime.now().isoformat()
                 memory_entry.access_count += 1
                 
+                # Bump recency of the cached copy
+                if memory_entry.id in self.memory_cache:
+                    self.memory_cache.move_to_end(memory_entry.id)
+                
                 memories.append(memory_entry)
             
             return memories
@@ -350,10 +760,24 @@ class AdvancedMemorySystem:
     def _search_fallback(self, query: str, memory_type: str, limit: int, min_importance: float) -> List[MemoryEntry]:
         """Search memories using fallback system"""
         try:
+            # Semantic search over the embedding matrix when there is a model and vectors
+            if self.embedding_model and self._emb_rows:
+                query_embedding = self._generate_embedding(query)
+                if query_embedding is not None:
+                    return self._search_fallback_semantic(query_embedding, memory_type, limit, min_importance)
+            
             memories = []
+            all_memories = self.fallback_memory["memories"]
             query_lower = query.lower()
             
-            for memory_dict in self.fallback_memory["memories"]:
+            # Memories containing the query as a substring
+            candidates = [i for i in self._fallback_candidates(query_lower)
+                          if query_lower in self._content_lower[i]]
+            
+            matches = []
+            for position in candidates:
+                memory_dict = all_memories[position]
+                
                 # Type filter
                 if memory_type and memory_dict.get("memory_type") != memory_type:
                     continue
@@ -362,20 +786,94 @@ class AdvancedMemorySystem:
                 if memory_dict.get("importance", 0) < min_importance:
                     continue
                 
-                # Simple text matching
-                content_lower = memory_dict.get("content", "").lower()
-                if query_lower in content_lower:
-                    memory_entry = MemoryEntry(**memory_dict)
-                    memories.append(memory_entry)
+                matches.append(memory_dict)
             
-            # Sort by importance and limit
-            memories.sort(key=lambda x: x.importance, reverse=True)
-            return memories[:limit]
+            # Select the top `limit` by importance without sorting every match
+            k = min(limit, len(matches))
+            if k <= 0:
+                return []
+            importance = np.fromiter((memory_dict.get("importance", 0) for memory_dict in matches),
+                                     dtype=np.float64, count=len(matches))
+            top = np.argpartition(-importance, k - 1)[:k]
+            top = top[np.lexsort((top, -importance[top]))]  # importance desc, ties in match order
+            
+            for i in top:
+                memory_entry = MemoryEntry(**matches[i])
+                memory_entry.embedding = dequantize_embedding(memory_entry.embedding)
+                memories.append(memory_entry)
+            return memories
             
         except Exception as e:
             logger.error(f"Fallback search failed: {e}")
             return []
     
+    def _fallback_candidates(self, query_lower: str):
+        """Positions of fallback memories that may contain query_lower, from the inverted index"""
+        # (word, bounded_left, bounded_right), whole words first since they are one lookup
+        words = sorted(((match.group(), match.start() > 0, match.end() < len(query_lower))
+                        for match in _WORD_RE.finditer(query_lower)),
+                       key=lambda item: not (item[1] and item[2]))
+        pool = None
+        for word, bounded_left, bounded_right in words:
+            if bounded_left and bounded_right:
+                # A non-word character on both sides, so it occurs as a whole word
+                postings = self._inv_index.get(word, set())
+            else:
+                # Cut off by the query's edge: it is a prefix, suffix or substring of an indexed word
+                if bounded_left:
+                    vocab = [w for w in self._inv_index if w.startswith(word)]
+                elif bounded_right:
+                    vocab = [w for w in self._inv_index if w.endswith(word)]
+                else:
+                    vocab = [w for w in self._inv_index if word in w]
+                postings = set().union(*(self._inv_index[w] for w in vocab))
+            pool = postings if pool is None else pool & postings
+            if not pool:
+                return []
+        
+        # A query without word characters can't use the index
+        return range(len(self._content_lower)) if pool is None else sorted(pool)
+    
+    def _search_fallback_semantic(self, query_embedding: List[float], memory_type: str,
+                                  limit: int, min_importance: float) -> List[MemoryEntry]:
+        """Rank fallback memories by cosine similarity to the query embedding"""
+        query_vector = np.asarray(query_embedding, dtype=np.float32)
+        if query_vector.size != self._emb_matrix.shape[1]:
+            return []
+        norm = np.linalg.norm(query_vector)
+        if norm > 0:
+            query_vector = query_vector / norm
+        
+        scores = self._emb_matrix[:len(self._emb_rows)] @ query_vector
+        all_memories = self.fallback_memory["memories"]
+        
+        memories = []
+        for row in np.argsort(-scores):
+            memory_dict = all_memories[self._emb_rows[row]]
+            if memory_type and memory_dict.get("memory_type") != memory_type:
+                continue
+            if memory_dict.get("importance", 0) < min_importance:
+                continue
+            
+            memory_entry = MemoryEntry(**memory_dict)
+            memory_entry.embedding = dequantize_embedding(memory_entry.embedding)
+            memories.append(memory_entry)
+            if len(memories) >= limit:
+                break
+        
+        return memories
+    
+    def _iter_collection(self, include: Tuple[str, ...] = ("metadatas",), where: Dict = None):
+        """Yield collection.get results page by page, fetching only the included fields"""
+        offset = 0
+        while True:
+            page = self.collection.get(limit=self.CHROMA_PAGE_SIZE, offset=offset,
+                                       include=list(include), where=where)
+            if not page['ids']:
+                return
+            yield page
+            offset += len(page['ids'])
+    
     def get_memory_stats(self) -> Dict[str, Any]:
         """Get statistics about the memory system"""
         try:
@@ -385,7 +883,10 @@ class AdvancedMemorySystem:
                 "memory_types": {},
                 "average_importance": 0.0,
                 "cache_size": len(self.memory_cache),
-                "embedding_model": self.embedding_model is not None
+                # Whether embeddings are available, without forcing the lazy load
+                "embedding_model": SENTENCE_TRANSFORMERS_AVAILABLE and (
+                    self._embedding_model is not None or not self._embedding_model_loaded),
+                "embedding_model_loaded": self._embedding_model is not None
             }
             
             if self.collection:
@@ -393,15 +894,15 @@ class AdvancedMemorySystem:
                 count = self.collection.count()
                 stats["total_memories"] = count
                 
-                # Get all memories for type analysis
+                # Stream metadata only for type analysis
                 if count > 0:
-                    results = self.collection.get()
                     memory_types = defaultdict(int)
                     importance_sum = 0
                     
-                    for metadata in results['metadatas']:
-                        memory_types[metadata['memory_type']] += 1
-                        importance_sum += metadata['importance']
+                    for page in self._iter_collection():
+                        for metadata in page['metadatas']:
+                            memory_types[metadata['memory_type']] += 1
+                            importance_sum += metadata['importance']
                     
                     stats["memory_types"] = dict(memory_types)
                     stats["average_importance"] = importance_sum / count if count > 0 else 0
@@ -454,20 +955,20 @@ class AdvancedMemorySystem:
             memories_data = []
             
             if self.collection:
-                results = self.collection.get()
-                for i, doc in enumerate(results['documents']):
-                    metadata = results['metadatas'][i]
-                    memory_data = {
-                        "id": metadata['id'],
-                        "content": doc,
-                        "timestamp": metadata['timestamp'],
-                        "memory_type": metadata['memory_type'],
-                        "importance": metadata['importance'],
-                        "tags": json.loads(metadata.get('tags', '[]')),
-                        "metadata": json.loads(metadata.get('metadata', '{}')),
-                        "access_count": metadata.get('access_count', 0)
-                    }
-                    memories_data.append(memory_data)
+                for page in self._iter_collection(include=("documents", "metadatas")):
+                    for doc, metadata in zip(page['documents'], page['metadatas']):
+                        tags, entry_metadata = _from_chroma_metadata(metadata)
+                        memory_data = {
+                            "id": metadata['id'],
+                            "content": doc,
+                            "timestamp": metadata['timestamp'],
+                            "memory_type": metadata['memory_type'],
+                            "importance": metadata['importance'],
+                            "tags": tags,
+                            "metadata": entry_metadata,
+                            "access_count": metadata.get('access_count', 0)
+                        }
+                        memories_data.append(memory_data)
             else:
                 memories_data = self.fallback_memory.get("memories", [])
             
@@ -492,17 +993,20 @@ class AdvancedMemorySystem:
             cutoff_str = cutoff_date.isoformat()
             
             if self.collection:
-                # ChromaDB cleanup
-                results = self.collection.get()
+                # ChromaDB cleanup: the importance predicate runs inside Chroma (its $lt
+                # only takes numbers, so the ISO timestamp check stays here), then
+                # matching ids are deleted in chunks
                 ids_to_delete = []
                 
-                for i, metadata in enumerate(results['metadatas']):
-                    if (metadata['timestamp'] < cutoff_str and 
-                        metadata['importance'] < min_importance):
-                        ids_to_delete.append(metadata['id'])
+                low_importance = {"importance": {"$lt": min_importance}}
+                for page in self._iter_collection(where=low_importance):
+                    for metadata in page['metadatas']:
+                        if metadata['timestamp'] < cutoff_str:
+                            ids_to_delete.append(metadata['id'])
                 
                 if ids_to_delete:
-                    self.collection.delete(ids=ids_to_delete)
+                    for start in range(0, len(ids_to_delete), self.CHROMA_DELETE_BATCH):
+                        self.collection.delete(ids=ids_to_delete[start:start + self.CHROMA_DELETE_BATCH])
                     logger.info(f"✅ Cleaned up {len(ids_to_delete)} old memories")
             
             else:
@@ -510,12 +1014,13 @@ class AdvancedMemorySystem:
                 original_count = len(self.fallback_memory["memories"])
                 self.fallback_memory["memories"] = [
                     memory for memory in self.fallback_memory["memories"]
-                    if not (memory.get("timestamp", "") < cutoff_str and 
-                           memory.get("importance", 0) < min_importance)
+                    if memory.get("importance", 0) >= min_importance
+                    or memory.get("timestamp", "") >= cutoff_str
                 ]
                 
                 cleaned_count = original_count - len(self.fallback_memory["memories"])
                 if cleaned_count > 0:
+                    self._rebuild_fallback_index()
                     self._save_fallback_memory()
                     logger.info(f"✅ Cleaned up {cleaned_count} old memories")
             
@@ -11,6 +11,7 @@ import base64
 import json
 import sqlite3
 import logging
+from functools import lru_cache
 from typing import Dict, Any, Optional, Union
 from datetime import datetime, timedelta
 from dataclasses import dataclass
@@ -43,6 +44,18 @@ class SecurityConfig:
     max_retries: int = 3
     backoff_factor: float = 0.5
 
+@lru_cache(maxsize=8)
+def _derive_fernet_key(password: bytes, salt: bytes, length: int, iterations: int = 100000) -> bytes:
+    """Derive a Fernet key with PBKDF2, cached per (password, salt) for the process"""
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=length,
+        salt=salt,
+        iterations=iterations,
+        backend=default_backend()
+    )
+    return base64.urlsafe_b64encode(kdf.derive(password))
+
 class EncryptionManager:
     """Handles encryption and decryption of sensitive data"""
     
@@ -79,14 +92,8 @@ class EncryptionManager:
             os.chmod(salt_file, 0o600)
         
         # Derive encryption key from master password
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=self.config.encryption_key_length,
-            salt=self._salt,
-            iterations=100000,
-            backend=default_backend()
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(self._master_password.encode()))
+        key = _derive_fernet_key(self._master_password.encode(), self._salt,
+                                 self.config.encryption_key_length)
         self._encryption_key = Fernet(key)
     
     def encrypt_data(self, data: Union[str, bytes]) -> str:
@@ -6,6 +6,7 @@ import sqlite3
 from unittest.mock import Mock, patch, MagicMock
 import sys
 from datetime import datetime, timedelta
+from time import perf_counter_ns
 
 # Add parent directory to path to import our modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -16,23 +17,22 @@ from claude_desktop import (
     ConfigurationManager
 )
 
-class TestConversationDatabase(unittest.TestCase):
-    """Test cases for ConversationDatabase class"""
+class TempDatabaseTestCase(unittest.TestCase):
+    """Base class for tests that need a fresh on-disk ConversationDatabase"""
     
     def setUp(self):
         """Set up test database"""
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-        self.temp_db.close()
-        self.db = ConversationDatabase(self.temp_db.name)
-        
-    def tearDown(self):
-        """Clean up test database"""
-        if os.path.exists(self.temp_db.name):
-            os.unlink(self.temp_db.name)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.db_path = os.path.join(self.temp_dir.name, 'test.db')
+        self.db = ConversationDatabase(self.db_path)
+
+class TestConversationDatabase(TempDatabaseTestCase):
+    """Test cases for ConversationDatabase class"""
     
     def test_database_initialization(self):
         """Test database tables are created correctly"""
-        conn = sqlite3.connect(self.temp_db.name)
+        conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
         # Check if tables exist
@@ -56,7 +56,7 @@ class TestConversationDatabase(unittest.TestCase):
         conversation_id = self.db.save_conversation(session_id, messages, "Test conversation")
         
         # Verify conversation was saved
-        conn = sqlite3.connect(self.temp_db.name)
+        conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
         cursor.execute("SELECT * FROM conversations WHERE id = ?", (conversation_id,))
@@ -175,21 +175,14 @@ class TestConversationAnalyzer(unittest.TestCase):
         empty_summary = self.analyzer.generate_conversation_summary([])
         self.assertEqual(empty_summary, "Empty conversation")
 
-class TestConfigurationManager(unittest.TestCase):
+class TestConfigurationManager(TempDatabaseTestCase):
     """Test cases for ConfigurationManager class"""
     
     def setUp(self):
         """Set up configuration manager"""
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-        self.temp_db.close()
-        self.db = ConversationDatabase(self.temp_db.name)
+        super().setUp()
         self.config = ConfigurationManager(self.db)
     
-    def tearDown(self):
-        """Clean up test database"""
-        if os.path.exists(self.temp_db.name):
-            os.unlink(self.temp_db.name)
-    
     def test_default_configuration(self):
         """Test default configuration values"""
         self.assertEqual(self.config.get('model'), 'claude-3-5-sonnet-20241022')
@@ -226,22 +219,15 @@ class TestConfigurationManager(unittest.TestCase):
         self.assertEqual(self.config.get('nonexistent_key', 'default_value'), 'default_value')
         self.assertIsNone(self.config.get('nonexistent_key'))
 
-class TestIntegration(unittest.TestCase):
+class TestIntegration(TempDatabaseTestCase):
     """Integration tests for the enhanced application"""
     
     def setUp(self):
         """Set up integration test environment"""
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-        self.temp_db.close()
-        self.db = ConversationDatabase(self.temp_db.name)
+        super().setUp()
         self.analyzer = ConversationAnalyzer()
         self.config = ConfigurationManager(self.db)
     
-    def tearDown(self):
-        """Clean up test environment"""
-        if os.path.exists(self.temp_db.name):
-            os.unlink(self.temp_db.name)
-    
     def test_full_conversation_workflow(self):
         """Test complete conversation workflow"""
         # Create a conversation
@@ -327,7 +313,7 @@ class TestIntegration(unittest.TestCase):
         }
         
         # Test JSON serialization
-        json_data = json.dumps(export_data, indent=2)
+        json_data = json.dumps(export_data, separators=(',', ':'))
         self.assertIsInstance(json_data, str)
         
         # Test deserialization
@@ -336,21 +322,14 @@ class TestIntegration(unittest.TestCase):
         self.assertEqual(len(imported_data['conversation']), 2)
         self.assertIn('analytics', imported_data)
 
-class TestPerformance(unittest.TestCase):
+class TestPerformance(TempDatabaseTestCase):
     """Performance tests for the enhanced application"""
     
     def setUp(self):
         """Set up performance test environment"""
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-        self.temp_db.close()
-        self.db = ConversationDatabase(self.temp_db.name)
+        super().setUp()
         self.analyzer = ConversationAnalyzer()
     
-    def tearDown(self):
-        """Clean up test environment"""
-        if os.path.exists(self.temp_db.name):
-            os.unlink(self.temp_db.name)
-    
     def test_large_conversation_analysis(self):
         """Test performance with large conversations"""
         # Create a large conversation
@@ -362,11 +341,9 @@ class TestPerformance(unittest.TestCase):
             })
         
         # Measure analysis time
-        start_time = datetime.now()
+        t0 = perf_counter_ns()
         quality_score = self.analyzer.analyze_conversation_quality(large_conversation)
-        end_time = datetime.now()
-        
-        analysis_time = (end_time - start_time).total_seconds()
+        analysis_time = (perf_counter_ns() - t0) / 1e9
         
         # Verify results
         self.assertGreater(quality_score, 0.0)
@@ -375,28 +352,30 @@ class TestPerformance(unittest.TestCase):
     def test_database_performance(self):
         """Test database performance with multiple conversations"""
         # Create multiple conversations
-        start_time = datetime.now()
+        t0 = perf_counter_ns()
         
+        conversations = []
         for i in range(10):
-            session_id = f"perf_test_session_{i}"
-            messages = [
-                {"role": "user", "content": f"Test message {i}"},
-                {"role": "assistant", "content": f"Test response {i}"}
-            ]
-            self.db.save_conversation(session_id, messages, f"Test conversation {i}")
+            conversations.append({
+                "session_id": f"perf_test_session_{i}",
+                "messages": [
+                    {"role": "user", "content": f"Test message {i}"},
+                    {"role": "assistant", "content": f"Test response {i}"}
+                ],
+                "title": f"Test conversation {i}"
+            })
+        conversation_ids = self.db.save_conversations_bulk(conversations)
         
-        end_time = datetime.now()
-        save_time = (end_time - start_time).total_seconds()
+        save_time = (perf_counter_ns() - t0) / 1e9
         
         # Verify performance
+        self.assertEqual(len(conversation_ids), 10)
         self.assertLess(save_time, 2.0)  # Should complete within 2 seconds
         
         # Test analytics performance
-        start_time = datetime.now()
+        t0 = perf_counter_ns()
         analytics = self.db.get_conversation_analytics(30)
-        end_time = datetime.now()
-        
-        analytics_time = (end_time - start_time).total_seconds()
+        analytics_time = (perf_counter_ns() - t0) / 1e9
         
         # Verify results
         self.assertEqual(analytics['total_conversations'], 10)
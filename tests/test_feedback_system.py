@@ -0,0 +1,243 @@
+import unittest
+import tempfile
+import os
+import sqlite3
+import subprocess
+import sys
+import textwrap
+import gc
+import weakref
+from unittest.mock import Mock
+
+# Add parent directory to path to import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import feedback_system
+from feedback_system import FeedbackAnalytics, FeedbackDatabase, comment_theme_hash, submit_background_write
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class TempFeedbackDatabaseTestCase(unittest.TestCase):
+    """Base class for tests that need a fresh on-disk FeedbackDatabase"""
+    
+    def setUp(self):
+        """Set up test database"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.db_path = os.path.join(self.temp_dir.name, 'feedback.db')
+    
+    def open_db(self) -> FeedbackDatabase:
+        db = FeedbackDatabase(self.db_path)
+        self.addCleanup(db.close)
+        return db
+
+class TestFeatureUsage(TempFeedbackDatabaseTestCase):
+    """Test cases for buffered feature usage tracking"""
+    
+    def test_usage_flushed_on_exit(self):
+        """Test that buffered usage reaches the database when the process exits"""
+        script = textwrap.dedent(f'''
+            import sys
+            sys.path.insert(0, {PROJECT_ROOT!r})
+            from feedback_system import FeedbackDatabase
+            db = FeedbackDatabase({self.db_path!r})
+            db.track_feature_usage("voice_input", "s1")
+            db.track_feature_usage("voice_input", "s1")
+        ''')
+        subprocess.run([sys.executable, "-c", script], check=True, capture_output=True)
+        
+        conn = sqlite3.connect(self.db_path)
+        self.addCleanup(conn.close)
+        rows = conn.execute("SELECT feature_name, user_session, usage_count FROM feature_usage").fetchall()
+        self.assertEqual(rows, [("voice_input", "s1", 2)])
+    
+    def test_closed_database_can_be_collected(self):
+        """Test that the exit flush doesn't keep closed databases alive"""
+        db = FeedbackDatabase(self.db_path)
+        db.track_feature_usage("voice_input", "s1")
+        db.close()
+        db_ref = weakref.ref(db)
+        del db
+        gc.collect()
+        self.assertIsNone(db_ref())
+
+class TestFeedbackAnalytics(TempFeedbackDatabaseTestCase):
+    """Test cases for get_feedback_analytics"""
+    
+    def test_features_and_comments_most_frequent_first(self):
+        """Test that feature usage and common comments are ordered by count"""
+        db = self.open_db()
+        for feature_name, count in [("export", 1), ("voice_input", 5), ("search", 3)]:
+            for _ in range(count):
+                db.track_feature_usage(feature_name, "s1")
+        for comment in ["slow", "great", "slow", "slow", "great", "ok"]:
+            db.save_feedback({"session_id": "s1", "feedback_type": "quick", "rating": 4, "comment": comment})
+        
+        analytics = db.get_feedback_analytics()
+        self.assertEqual(list(analytics['feature_usage'].items()),
+                         [("voice_input", 5), ("search", 3), ("export", 1)])
+        self.assertEqual(list(analytics['common_feedback'].items()),
+                         [("slow", 3), ("great", 2), ("ok", 1)])
+        self.assertEqual(analytics['total_feedback'], 6)
+    
+    def test_details_pages_until_exhausted(self):
+        """Test that the details tab can page before any reload and stops at the last row"""
+        db = self.open_db()
+        for rating in range(FeedbackAnalytics.DETAILS_PAGE_SIZE + 5):
+            db.save_feedback({"session_id": "s1", "feedback_type": "quick", "rating": rating % 5 + 1})
+        
+        dashboard = FeedbackAnalytics(None, db=db)
+        tree = Mock()
+        for _ in range(3):
+            dashboard.load_details_page(tree)
+        self.assertEqual(tree.insert.call_count, FeedbackAnalytics.DETAILS_PAGE_SIZE + 5)
+
+class TestSchemaMigration(TempFeedbackDatabaseTestCase):
+    """Test cases for upgrading databases written by older versions"""
+    
+    LEGACY_SCHEMA = '''
+        CREATE TABLE user_feedback (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT NOT NULL,
+            feedback_type TEXT NOT NULL,
+            rating INTEGER,
+            comment TEXT,
+            feature_request TEXT,
+            bug_report TEXT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            response_time REAL,
+            conversation_context TEXT
+        );
+        CREATE TABLE feature_usage (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            feature_name TEXT NOT NULL,
+            usage_count INTEGER DEFAULT 1,
+            last_used DATETIME DEFAULT CURRENT_TIMESTAMP,
+            user_session TEXT
+        );
+    '''
+    
+    def create_legacy_db(self):
+        """Write an unversioned database with duplicate feature_usage rows"""
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(self.LEGACY_SCHEMA)
+        conn.executemany(
+            "INSERT INTO feature_usage (feature_name, usage_count, last_used, user_session) VALUES (?, ?, ?, ?)",
+            [("voice_input", 1, "2024-01-01 10:00:00", "s1"),
+             ("search", 2, "2024-01-02 10:00:00", "s1"),
+             ("voice_input", 3, "2024-01-03 10:00:00", "s1"),
+             ("voice_input", 1, "2024-01-02 10:00:00", "s2"),
+             ("search", 1, "2024-01-01 10:00:00", None),
+             ("search", 4, "2024-01-04 10:00:00", None)]
+        )
+        conn.executemany(
+            "INSERT INTO user_feedback (session_id, feedback_type, rating, comment) VALUES (?, ?, ?, ?)",
+            [("s1", "quick", 5, "Really fast responses"), ("s1", "quick", 4, ""), ("s2", "quick", 3, None)]
+        )
+        conn.commit()
+        conn.close()
+    
+    def read(self, sql):
+        conn = sqlite3.connect(self.db_path)
+        self.addCleanup(conn.close)
+        return conn.execute(sql).fetchall()
+    
+    def test_duplicate_feature_usage_folded(self):
+        """Test that an unversioned database's duplicate usage rows fold into one per (feature, session)"""
+        self.create_legacy_db()
+        self.open_db()
+        
+        rows = self.read('''
+            SELECT feature_name, user_session, usage_count, last_used
+            FROM feature_usage ORDER BY feature_name, user_session
+        ''')
+        self.assertEqual(rows, [
+            ("search", None, 5, "2024-01-04 10:00:00"),
+            ("search", "s1", 2, "2024-01-02 10:00:00"),
+            ("voice_input", "s1", 4, "2024-01-03 10:00:00"),
+            ("voice_input", "s2", 1, "2024-01-02 10:00:00"),
+        ])
+        self.assertEqual(self.read("PRAGMA user_version"), [(FeedbackDatabase.SCHEMA_VERSION,)])
+        
+        conn = sqlite3.connect(self.db_path)
+        self.addCleanup(conn.close)
+        with self.assertRaises(sqlite3.IntegrityError):
+            conn.execute("INSERT INTO feature_usage (feature_name, user_session) VALUES ('search', 's1')")
+    
+    def test_comment_hash_backfilled(self):
+        """Test that existing comments gain a comment_hash, while blank ones stay NULL"""
+        self.create_legacy_db()
+        self.open_db()
+        
+        rows = self.read("SELECT comment, comment_hash FROM user_feedback ORDER BY id")
+        self.assertEqual(rows, [("Really fast responses", comment_theme_hash("Really fast responses")),
+                                ("", None), (None, None)])
+        self.assertEqual(comment_theme_hash("the responses are FAST"), comment_theme_hash("Really fast responses"))
+    
+    def test_current_database_reopened_unchanged(self):
+        """Test that reopening an up-to-date database keeps its data"""
+        db = self.open_db()
+        db.track_feature_usage("search", "s1")
+        db.close()
+        self.open_db()
+        self.assertEqual(self.read("SELECT feature_name, usage_count FROM feature_usage"), [("search", 1)])
+
+class TestBackgroundWrites(TempFeedbackDatabaseTestCase):
+    """Test cases for the background write queue"""
+    
+    def test_queued_writes_land_in_order(self):
+        """Test that queued feedback is written by the writer thread, in submission order"""
+        db = self.open_db()
+        for rating in (1, 2, 3, 4, 5):
+            submit_background_write(db.save_feedback, {"session_id": "s1", "feedback_type": "quick",
+                                                       "rating": rating, "comment": f"c{rating}"})
+        feedback_system._write_queue.join()
+        
+        conn = sqlite3.connect(self.db_path)
+        self.addCleanup(conn.close)
+        rows = conn.execute("SELECT rating FROM user_feedback ORDER BY id").fetchall()
+        self.assertEqual(rows, [(1,), (2,), (3,), (4,), (5,)])
+    
+    def test_failed_write_does_not_stop_the_queue(self):
+        """Test that an exception in one queued call doesn't block later writes"""
+        db = self.open_db()
+        submit_background_write(db.save_response_rating, "m1", None)  # rating is NOT NULL
+        submit_background_write(db.save_response_rating, "m2", 5)
+        feedback_system._write_queue.join()
+        
+        conn = sqlite3.connect(self.db_path)
+        self.addCleanup(conn.close)
+        self.assertEqual(conn.execute("SELECT message_id FROM response_ratings").fetchall(), [("m2",)])
+
+class TestAnalyticsCache(TempFeedbackDatabaseTestCase):
+    """Test cases for the get_feedback_analytics cache"""
+    
+    def test_cached_until_write(self):
+        """Test that analytics are reused until a write invalidates them"""
+        db = self.open_db()
+        db.save_feedback({"session_id": "s1", "feedback_type": "quick", "rating": 5})
+        first = db.get_feedback_analytics()
+        self.assertIs(db.get_feedback_analytics(), first)
+        
+        db.save_feedback({"session_id": "s1", "feedback_type": "quick", "rating": 1})
+        second = db.get_feedback_analytics()
+        self.assertIsNot(second, first)
+        self.assertEqual(second['total_feedback'], 2)
+        
+        db.track_feature_usage("search", "s1")
+        self.assertEqual(db.get_feedback_analytics()['feature_usage'], {"search": 1})
+    
+    def test_cache_per_window(self):
+        """Test that each days window is cached separately"""
+        db = self.open_db()
+        self.assertIsNot(db.get_feedback_analytics(days=7), db.get_feedback_analytics(days=30))
+    
+    def test_cache_expires(self):
+        """Test that a cached result is recomputed once the TTL has passed"""
+        db = self.open_db()
+        db.ANALYTICS_CACHE_TTL = 0.0
+        first = db.get_feedback_analytics()
+        self.assertIsNot(db.get_feedback_analytics(), first)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import unittest
+import tempfile
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add parent directory to path to import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import memory_system
+from memory_system import AdvancedMemorySystem
+
+class FallbackMemoryTestCase(unittest.TestCase):
+    """Base class for tests against the JSON fallback store in a temp directory"""
+
+    def setUp(self):
+        """Force the fallback store and keyword search"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.memory_dir = os.path.join(self.temp_dir.name, 'memory')
+        for name in ('CHROMADB_AVAILABLE', 'SENTENCE_TRANSFORMERS_AVAILABLE'):
+            patcher = patch.object(memory_system, name, False)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def open_memory(self):
+        return AdvancedMemorySystem(self.memory_dir, use_onnx=False)
+
+class TestFallbackLog(FallbackMemoryTestCase):
+    """Test cases for the fallback append log"""
+
+    def test_torn_last_line(self):
+        """Test that a partial last record neither stops replay nor corrupts later appends"""
+        memory = self.open_memory()
+        memory.store_memory("first memory")
+        with open(memory.fallback_log_file, 'a', encoding='utf-8') as f:
+            f.write('{"id": "torn", "content": "interrup')
+
+        memory = self.open_memory()
+        for content in ("second memory", "third memory", "fourth memory"):
+            memory.store_memory(content)
+
+        reloaded = self.open_memory()
+        contents = sorted(m["content"] for m in reloaded.fallback_memory["memories"])
+        self.assertEqual(contents, ["first memory", "fourth memory", "second memory", "third memory"])
+
+class TestFallbackSearch(FallbackMemoryTestCase):
+    """Test cases for keyword search over the fallback store"""
+
+    def test_substring_match(self):
+        """Test that a whole-word hit doesn't hide memories containing the query as a substring"""
+        memory = self.open_memory()
+        memory.store_memory("I write python")
+        memory.store_memory("I write pythonic code")
+        memory.store_memory("I write rust")
+
+        for query in ("python", "pyth", "ytho", "ite pyth", "i write python", " python"):
+            contents = sorted(m.content for m in memory.search_memories(query, limit=10))
+            self.assertEqual(contents, ["I write python", "I write pythonic code"])
+        
+        self.assertEqual([m.content for m in memory.search_memories("pythonic", limit=10)],
+                         ["I write pythonic code"])
+        self.assertEqual(memory.search_memories("python code", limit=10), [])
+        self.assertEqual(memory.search_memories("ruby", limit=10), [])
+
+class TestMemoryStats(FallbackMemoryTestCase):
+    """Test cases for get_memory_stats"""
+
+    def test_embedding_model_flags(self):
+        """Test that stats report model availability without loading it, and a failed load"""
+        memory = self.open_memory()
+        stats = memory.get_memory_stats()
+        self.assertEqual((stats["embedding_model"], stats["embedding_model_loaded"]), (False, False))
+
+        with patch.object(memory_system, 'SENTENCE_TRANSFORMERS_AVAILABLE', True):
+            stats = memory.get_memory_stats()
+            self.assertEqual((stats["embedding_model"], stats["embedding_model_loaded"]), (True, False))
+
+            memory._embedding_model_loaded = True  # load attempted and failed
+            stats = memory.get_memory_stats()
+            self.assertEqual((stats["embedding_model"], stats["embedding_model_loaded"]), (False, False))
+
+class TestHnswSettings(FallbackMemoryTestCase):
+    """Test cases for HNSW settings on an existing collection"""
+
+    def check_mismatch(self, hnsw_params, level):
+        memory = AdvancedMemorySystem(self.memory_dir, use_onnx=False, hnsw_params=hnsw_params)
+        memory.collection = SimpleNamespace(metadata={"hnsw:space": "ip", "hnsw:M": 16})
+        with self.assertLogs(memory_system.logger, level='DEBUG') as logs:
+            memory._warn_on_hnsw_mismatch()
+        self.assertEqual([record.levelname for record in logs.records], [level])
+
+    def test_warns_only_for_requested_settings(self):
+        """Test that differing defaults are logged at debug level, explicit settings as a warning"""
+        self.check_mismatch(None, "DEBUG")
+        self.check_mismatch({"hnsw:M": 48}, "WARNING")
+
+class TestChromaMetadata(unittest.TestCase):
+    """Test cases for the Chroma metadata encoding"""
+
+    def test_tags_round_trip(self):
+        """Test that tags with commas or a leading bracket survive the round trip"""
+        for tags in ([], ["ui"], ["ui", "dark mode"], ["a,b", "c"], ["[draft]", "x"], ["[", "]"]):
+            entry = memory_system.MemoryEntry(
+                id="m1", content="c", timestamp="2024-01-01T00:00:00", memory_type="fact",
+                importance=0.5, tags=tags, metadata={"source": "test", "scores": [1, 2]}
+            )
+            chroma_metadata = memory_system._to_chroma_metadata(entry)
+            self.assertTrue(all(isinstance(v, (str, int, float, bool)) for v in chroma_metadata.values()))
+            self.assertEqual(memory_system._from_chroma_metadata(chroma_metadata),
+                             (tags, {"source": "test", "scores": [1, 2]}))
+
+class TestOnnxModelFile(unittest.TestCase):
+    """Test cases for picking the ONNX export by CPU"""
+    
+    def pick(self, machine, flags):
+        memory_system._default_onnx_model_file.cache_clear()
+        self.addCleanup(memory_system._default_onnx_model_file.cache_clear)
+        with patch.object(memory_system.platform, 'machine', return_value=machine), \
+                patch.object(memory_system, '_cpu_flags', return_value=frozenset(flags)):
+            return memory_system._default_onnx_model_file()
+    
+    def test_model_file_per_platform(self):
+        """Test that each architecture and x86 feature level gets its own variant"""
+        self.assertEqual(self.pick("aarch64", []), "onnx/model_qint8_arm64.onnx")
+        self.assertEqual(self.pick("ARM64", []), "onnx/model_qint8_arm64.onnx")
+        self.assertEqual(self.pick("x86_64", ["avx2", "avx512f", "avx512_vnni"]),
+                         "onnx/model_qint8_avx512_vnni.onnx")
+        self.assertEqual(self.pick("x86_64", ["avx2", "avx512f"]), "onnx/model_qint8_avx512.onnx")
+        self.assertEqual(self.pick("AMD64", []), "onnx/model_quint8_avx2.onnx")
+        self.assertEqual(self.pick("ppc64le", []), "onnx/model.onnx")
+
+if __name__ == '__main__':
+    unittest.main()
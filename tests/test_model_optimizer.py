@@ -0,0 +1,81 @@
+import unittest
+import tempfile
+import os
+import sqlite3
+import subprocess
+import sys
+import textwrap
+import gc
+import weakref
+from unittest.mock import patch
+
+# Add parent directory to path to import our modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model_optimizer import OptimizationManager, ResponseTimeOptimizer
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class TempOptimizerTestCase(unittest.TestCase):
+    """Base class for tests that need a fresh on-disk optimizer database"""
+
+    def setUp(self):
+        """Set up test database"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.db_path = os.path.join(self.temp_dir.name, 'conversations.db')
+
+class TestOptimizerLifetime(TempOptimizerTestCase):
+    """Test cases for closing optimizer connections"""
+
+    def test_buffered_trials_flushed_on_exit(self):
+        """Test that trial rows still in the buffer reach the database when the process exits"""
+        script = textwrap.dedent(f'''
+            import sys
+            sys.path.insert(0, {PROJECT_ROOT!r})
+            import optuna
+            from model_optimizer import ResponseTimeOptimizer
+            optimizer = ResponseTimeOptimizer({self.db_path!r})
+            study = optuna.create_study(study_name="exit_test")
+            optimizer.save_study_info("exit_test", "response_time", "minimize")
+            study.optimize(lambda trial: trial.suggest_float("x", 0, 1), n_trials=3,
+                           callbacks=[optimizer.trial_callback])
+        ''')
+        subprocess.run([sys.executable, "-c", script], check=True, capture_output=True)
+
+        conn = sqlite3.connect(self.db_path)
+        self.addCleanup(conn.close)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM optimization_trials").fetchone(), (3,))
+
+    def test_closed_manager_can_be_collected(self):
+        """Test that the exit hook doesn't keep closed managers and their optimizers alive"""
+        manager = OptimizationManager(self.db_path)
+        manager.close()
+        refs = [weakref.ref(manager)] + [weakref.ref(opt) for opt in manager.optimizers.values()]
+        del manager
+        gc.collect()
+        self.assertEqual([ref() for ref in refs], [None] * len(refs))
+
+class TestTableCreation(TempOptimizerTestCase):
+    """Test cases for creating optimizer tables once per database file"""
+
+    def test_recreated_database_gets_tables(self):
+        """Test that a database deleted and recreated in the same process gets its tables again"""
+        for _ in range(2):
+            optimizer = ResponseTimeOptimizer(self.db_path)
+            self.addCleanup(optimizer.close)
+            optimizer.save_study_info("recreated", "response_time", "minimize")
+            optimizer.close()
+            os.remove(self.db_path)
+
+    def test_open_optimizers_share_one_table_check(self):
+        """Test that a second optimizer on an open database skips the table creation"""
+        first = ResponseTimeOptimizer(self.db_path)
+        self.addCleanup(first.close)
+        with patch.object(ResponseTimeOptimizer, 'init_optimization_db') as init_db:
+            second = ResponseTimeOptimizer(self.db_path)
+            self.addCleanup(second.close)
+        init_db.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
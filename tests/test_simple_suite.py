@@ -15,16 +15,11 @@ class TestSimpleSuite(unittest.TestCase):
     
     def setUp(self):
         """Set up test environment"""
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-        self.temp_db.close()
-        self.db = ConversationDatabase(self.temp_db.name)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.db = ConversationDatabase(os.path.join(self.temp_dir.name, 'test.db'))
         self.analyzer = ConversationAnalyzer()
     
-    def tearDown(self):
-        """Clean up test environment"""
-        if os.path.exists(self.temp_db.name):
-            os.unlink(self.temp_db.name)
-    
     def test_database_basic_operations(self):
         """Test basic database operations"""
         # Ensure database is initialized